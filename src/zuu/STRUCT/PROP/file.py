@@ -123,7 +123,7 @@ class fileProperty:
             if dirname:  # Only create directories if there's a non-empty directory path
                 os.makedirs(dirname, exist_ok=True)
 
-            dump(value, path_str)
+            dump(value, path_str, atomic=True, skip_unchanged=True)
             # Update cache after saving
             cache_key = f"mtime:{path_str}"
             self._cache[cache_key] = os.path.getmtime(path_str)
@@ -1,6 +1,7 @@
 import os
 import json
 from typing import Any, Dict, Optional
+from zuu.io import dump_json
 
 
 class DictWithAutosave(dict):
@@ -41,8 +42,13 @@ class DictWithAutosave(dict):
 
     def _save(self) -> None:
         """Save current dictionary state to file."""
-        with open(self._path, "w") as f:
-            json.dump(dict(self), f, indent=2)
+        dump_json(
+            dict(self),
+            self._path,
+            atomic=True,
+            skip_unchanged=True,
+            dump={"indent": 2},
+        )
         self._last_mtime = os.path.getmtime(self._path)
 
     def _check_and_reload(self) -> None:
@@ -5,6 +5,9 @@ import functools as _functools
 import logging as _logging
 import sys as _sys
 
+from .patch import diff as diff, apply_patch as apply_patch
+
+
 def sha256(string: str) -> str:
     hasher = _hashlib.sha256()
     if not _os.path.exists(string):
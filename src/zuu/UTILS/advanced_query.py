@@ -1,6 +1,20 @@
-
-
+import asyncio
+import collections
+import importlib
+import inspect
+import itertools
+import os
+import sys
 import typing
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+RUN_MODES = ("thread", "process", "async")
+DEFAULT_BATCH = 256
 
 
 class AdvancedQuerySet:
@@ -28,13 +42,18 @@ class AdvancedQuerySet:
     def __queryObjMatchers(self):
         return self.__query._AdvancedQuery__matchers
 
+    def __invalidate(self):
+        self.__query._AdvancedQuery__plan = None
+
     def remove(self):
         self.__queryObjHandlers.pop(self.__index)
         self.__queryObjMatchers.pop(self.__index)
+        self.__invalidate()
 
     def handler(self):
         def decorator(func : typing.Callable):
             self.__handlers.append(func)
+            self.__invalidate()
         return decorator
 
     def matcher(self, any : bool | None = None):
@@ -46,11 +65,14 @@ class AdvancedQuerySet:
             if any is not None:
                 self.__queryObjMatchers[self.__index] = (any, mlist)
             mlist.append(func)
+            self.__invalidate()
             
         return decorator
 
 
 class AQCtx:
+    __slots__ = ("result", "matchmap", "cache")
+
     def __init__(self):
         self.result = None
         self.matchmap : typing.Dict[int, bool] = None
@@ -61,6 +83,7 @@ class AdvancedQuery:
         self.__counter = 0
         self.__handlers : typing.Dict[int, typing.List[typing.Callable]] = {}
         self.__matchers : typing.Dict[int, typing.Tuple[bool, typing.List[typing.Callable]]] = {}
+        self.__plan : typing.Optional[_AQPlan] = None
 
 
     def __write_func_meta(self, func : typing.Callable):
@@ -92,6 +115,7 @@ class AdvancedQuery:
             for handler in self.__handlers.values():
                 self.__write_func_meta(func)
                 handler.append(func)
+            self.__plan = None
         return decorator
 
     def appendToAllMatcher(self):
@@ -99,58 +123,371 @@ class AdvancedQuery:
             for flag, mlist in self.__matchers.values():
                 self.__write_func_meta(func)
                 mlist.append(func)
+            self.__plan = None
         return decorator
 
-    def match(self, item, ctx : AQCtx):
-        functionCache = {}
-        ctx.matchmap = {}
-
-        for id, (flag, mlist) in self.__matchers.items():
+    def compile(self) -> "_AQPlan":
+        """
+        Freeze the registered matchers and handlers into a plan.
 
-            allres = []
-            isany = (flag is None or flag)
+        Each matcher group becomes one short-circuiting ``or`` (``any``) or
+        ``and`` (``all``) expression, every distinct matcher function is
+        called at most once per item, and whether it takes ``ctx`` is
+        decided here instead of per call. ``match`` and ``handle`` compile
+        on first use; registering anything afterwards drops the plan.
+        """
+        if self.__plan is None:
+            self.__plan = _AQPlan(self.__matchers, self.__handlers)
+        return self.__plan
 
-            for func in mlist:
-                # resolve function res
-                if func in functionCache:
-                    res = functionCache[func]
-                elif func.__ctx_required__:
-                    res = func(ctx, item)
-                    functionCache[func] = res
-                else:
-                    res = func(item)
-                    functionCache[func] = res
-
-                if isany and res:
-                    # any
-                    allres.append(res)
-                    break
-                else:
-                    # all
-                    if not res:
-                        allres = []
-                        break
-                
-                allres.append(res)
-
-            if not allres:
-                ctx.matchmap[id] = False
-            elif isany:
-                ctx.matchmap[id] = any(allres)
-            else:
-                ctx.matchmap[id] = all(allres)
+    def match(self, item, ctx : AQCtx):
+        return (self.__plan or self.compile()).match(ctx, item)
 
-        return ctx
-    
     def handle(self,  ctx : AQCtx, item, **kwargs):
+        plan = self.__plan or self.compile()
         if not ctx.matchmap:
-            self.match(item, ctx)
+            plan.match(ctx, item)
 
         ctx.result = item
-        for i, handler in self.__handlers.items():
-            if ctx.matchmap[i]:
+        matchmap = ctx.matchmap
+        for i, handler in plan.handlers:
+            if matchmap[i]:
                 for func in handler:
                     res = func(ctx, **kwargs)
                     if res:
                         ctx.result = res
 
+    async def ahandle(self, ctx : AQCtx, item, **kwargs):
+        """
+        Like :meth:`handle`, awaiting matchers and handlers that return
+        awaitables.
+        """
+        plan = self.__plan or self.compile()
+        if not ctx.matchmap:
+            await plan.amatch(ctx, item)
+
+        ctx.result = item
+        matchmap = ctx.matchmap
+        for i, handler in plan.handlers:
+            if matchmap[i]:
+                for func in handler:
+                    res = await _resolve(func(ctx, **kwargs))
+                    if res:
+                        ctx.result = res
+
+    def handle_many(self, items : typing.Iterable, key : typing.Callable = None, **kwargs) -> list:
+        """
+        Handle each item with a fresh :class:`AQCtx` and return the results.
+
+        Args:
+            items (Iterable): The items.
+            key (Callable, optional): Items with equal ``key(item)`` share one
+                match, so matchers must depend on the key alone. Defaults to None.
+            **kwargs: Passed to the handlers.
+        """
+        plan = self.__plan or self.compile()
+        match, handlers = plan.match, plan.handlers
+        memo = {}
+        results = []
+        for item in items:
+            ctx = AQCtx()
+            if key is None:
+                matchmap = match(ctx, item).matchmap
+            else:
+                k = key(item)
+                matchmap = memo.get(k)
+                if matchmap is None:
+                    matchmap = memo[k] = match(ctx, item).matchmap
+                ctx.matchmap = matchmap
+
+            # same as handle(), inlined
+            ctx.result = item
+            for i, handler in handlers:
+                if matchmap[i]:
+                    for func in handler:
+                        res = func(ctx, **kwargs)
+                        if res:
+                            ctx.result = res
+            results.append(ctx.result)
+        return results
+
+    def run(
+        self,
+        iterable : typing.Iterable,
+        workers : typing.Optional[int] = None,
+        mode : str = "thread",
+        ordered : bool = True,
+        key : typing.Callable = None,
+        batch : int = DEFAULT_BATCH,
+        **kwargs,
+    ):
+        """
+        Stream items through match and handle, yielding each ``ctx.result``.
+
+        Items are read lazily in batches of ``batch``; at most ``2 * workers``
+        batches (``workers`` items in async mode) are in flight, so a
+        slow consumer or an endless stream never queues unbounded work.
+
+        Args:
+            iterable (Iterable): The items; an async iterable in async mode too.
+            workers (int, optional): Pool size, or concurrent items in async
+                mode. Defaults to the CPU count.
+            mode (str, optional): ``"thread"``, ``"process"`` or ``"async"``.
+                In process mode a query bound to a module global is
+                re-imported by name in the workers, which re-runs its
+                decorator registrations; any other query is pickled, so its
+                matchers and handlers must be importable by name. ``key``
+                and kwargs must be picklable. Async mode
+                returns an async iterator and awaits matchers and handlers
+                that return awaitables. Defaults to "thread".
+            ordered (bool, optional): Yield in input order instead of
+                completion order. Defaults to True.
+            key (Callable, optional): Within a batch, items with equal
+                ``key(item)`` share one match. Defaults to None.
+            batch (int, optional): Items per batch. Defaults to DEFAULT_BATCH.
+            **kwargs: Passed to the handlers.
+
+        Example:
+            >>> for result in query.run(lines, workers=4, key=str.strip):
+            ...     print(result)
+        """
+        if mode not in RUN_MODES:
+            raise ValueError(f"mode must be one of {RUN_MODES}")
+        workers = workers or os.cpu_count() or 1
+        plan = self.compile()
+        if mode == "async":
+            return self.__arun(iterable, workers, ordered, key, batch, kwargs)
+        if plan.isAsync:
+            raise ValueError("Async matchers or handlers require mode='async'")
+        return self.__run(iterable, workers, mode, ordered, key, batch, kwargs)
+
+    def __run(self, iterable, workers, mode, ordered, key, batch, kwargs):
+        batches = _batches(iterable, batch)
+        if workers == 1 and mode == "thread":
+            for items in batches:
+                yield from self.handle_many(items, key, **kwargs)
+            return
+
+        if mode == "thread":
+            executor = ThreadPoolExecutor(workers)
+            job = self.handle_many
+        else:
+            executor = ProcessPoolExecutor(
+                workers, initializer=_install, initargs=(_portable(self),)
+            )
+            job = _handle_installed
+        pending = collections.deque() if ordered else set()
+        finished = False
+        try:
+            for items in batches:
+                future = executor.submit(job, items, key, **kwargs)
+                if ordered:
+                    pending.append(future)
+                    if len(pending) >= 2 * workers:
+                        yield from pending.popleft().result()
+                else:
+                    pending.add(future)
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from future.result()
+            if ordered:
+                while pending:
+                    yield from pending.popleft().result()
+            else:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            finished = True
+        finally:
+            # a consumer that stops early should not wait for queued batches
+            executor.shutdown(wait=finished, cancel_futures=not finished)
+
+    async def __arun(self, iterable, workers, ordered, key, batch, kwargs):
+        plan = self.__plan or self.compile()
+        memo = {}
+
+        async def matchmap(item):
+            return (await plan.amatch(AQCtx(), item)).matchmap
+
+        async def one(item, shared):
+            ctx = AQCtx()
+            if shared is not None:
+                ctx.matchmap = await shared
+            await self.ahandle(ctx, item, **kwargs)
+            return ctx.result
+
+        pending = collections.deque() if ordered else set()
+        count = 0
+        try:
+            async for item in _aiter(iterable):
+                shared = None
+                if key is not None:
+                    count += 1
+                    if count > batch:
+                        memo.clear()
+                        count = 1
+                    k = key(item)
+                    shared = memo.get(k)
+                    if shared is None:
+                        shared = memo[k] = asyncio.ensure_future(matchmap(item))
+                task = asyncio.ensure_future(one(item, shared))
+                if ordered:
+                    pending.append(task)
+                    if len(pending) >= workers:
+                        yield await pending.popleft()
+                else:
+                    pending.add(task)
+                    if len(pending) >= workers:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for task in done:
+                            yield task.result()
+            if ordered:
+                while pending:
+                    yield await pending.popleft()
+            else:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+        finally:
+            for task in itertools.chain(pending, memo.values()):
+                task.cancel()
+
+    def __getstate__(self):
+        # the generated plan is rebuilt on first use after unpickling
+        state = self.__dict__.copy()
+        state["_AdvancedQuery__plan"] = None
+        return state
+
+
+async def _resolve(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def _aiter(iterable):
+    if hasattr(iterable, "__aiter__"):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+def _batches(iterable : typing.Iterable, size : int) -> typing.Iterator[list]:
+    it = iter(iterable)
+    while items := list(itertools.islice(it, size)):
+        yield items
+
+
+# the query of a process worker, installed once per process
+_installed : typing.Optional["AdvancedQuery"] = None
+
+
+def _portable(query : "AdvancedQuery") -> tuple:
+    """
+    Return how a process worker gets ``query``: by module and global name
+    when the query is a module global, since decorator registration rebinds
+    the names of its functions and they no longer pickle by reference.
+    """
+    plan = query.compile()
+    funcs = itertools.chain(
+        *(mlist for _, mlist in query._AdvancedQuery__matchers.values()),
+        *(h for _, h in plan.handlers),
+    )
+    for moduleName in dict.fromkeys(getattr(f, "__module__", None) for f in funcs):
+        module = sys.modules.get(moduleName)
+        if moduleName == "__main__" or module is None:
+            continue
+        for name, value in vars(module).items():
+            if value is query:
+                return ("import", moduleName, name)
+    return ("pickle", query)
+
+
+def _install(payload : tuple):
+    global _installed
+    if payload[0] == "import":
+        _installed = getattr(importlib.import_module(payload[1]), payload[2])
+    else:
+        _installed = payload[1]
+
+
+def _handle_installed(items : list, key : typing.Callable, **kwargs) -> list:
+    return _installed.handle_many(items, key, **kwargs)
+
+
+_UNSET = object()
+
+
+class _AQPlan:
+    """
+    The compiled form of an :class:`AdvancedQuery`: a generated ``match``
+    function plus the handler lists as tuples.
+    """
+
+    __slots__ = ("match", "amatch", "handlers", "isAsync")
+
+    def __init__(self, matchers : dict, handlers : dict):
+        funcs : typing.Dict[typing.Callable, int] = {}
+        uses : typing.Dict[int, int] = {}
+        for flag, mlist in matchers.values():
+            for func in mlist:
+                n = funcs.setdefault(func, len(funcs))
+                uses[n] = uses.get(n, 0) + 1
+
+        namespace = {"_UNSET": _UNSET, "_resolve": _resolve}
+        calls = {}
+        for func, n in funcs.items():
+            namespace[f"f{n}"] = func
+            # matchers added through AdvancedQuerySet.matcher have no meta
+            required = getattr(func, "__ctx_required__", None)
+            if required is None:
+                required = "ctx" in func.__code__.co_varnames
+            calls[n] = f"f{n}(ctx, item)" if required else f"f{n}(item)"
+
+        def source(header: str, wrap: str) -> typing.List[str]:
+            lines = [header]
+            shared = [f"r{n}" for n in funcs.values() if uses[n] > 1]
+            if shared:
+                lines.append(f"    {' = '.join(shared)} = _UNSET")
+            entries = []
+            for i, (id, (flag, mlist)) in enumerate(matchers.items()):
+                tests = []
+                for func in mlist:
+                    n = funcs[func]
+                    call = wrap.format(calls[n])
+                    if uses[n] > 1:
+                        # shared by several groups: called once, then reused
+                        call = f"(r{n} if r{n} is not _UNSET else (r{n} := {call}))"
+                    tests.append(call)
+                if tests:
+                    joiner = " or " if flag is None or flag else " and "
+                    lines.append(f"    m{i} = True if {joiner.join(tests)} else False")
+                else:
+                    lines.append(f"    m{i} = False")
+                entries.append(f"{id!r}: m{i}")
+            lines.append(f"    ctx.matchmap = {{{', '.join(entries)}}}")
+            lines.append("    return ctx")
+            return lines
+
+        lines = source("def match(ctx, item):", "{}")
+        # the async variant awaits matchers that return awaitables
+        lines += source("async def amatch(ctx, item):", "(await _resolve({}))")
+        exec(compile("\n".join(lines), "<AdvancedQuery plan>", "exec"), namespace)
+        self.match = namespace["match"]
+        self.amatch = namespace["amatch"]
+        self.handlers = tuple(
+            (id, tuple(handler)) for id, handler in handlers.items() if handler
+        )
+        self.isAsync = any(
+            inspect.iscoroutinefunction(func)
+            for func in itertools.chain(funcs, *(h for _, h in self.handlers))
+        )
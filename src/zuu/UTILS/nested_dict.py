@@ -1,4 +1,106 @@
-def flatten_nested_dict(data: dict, parent_key: str = "", sep: str = ".") -> dict:
+import functools as _functools
+import re as _re
+import typing as _typing
+
+
+def _escape_key(key: str, sep: str, escape: str) -> str:
+    return key.replace(escape, escape + escape).replace(sep, escape + sep)
+
+
+@_functools.lru_cache(maxsize=32)
+def _escaped_split_pattern(sep: str, escape: str) -> _re.Pattern:
+    sep, escape = _re.escape(sep), _re.escape(escape)
+    return _re.compile(f"{escape}({escape}|{sep})|{sep}")
+
+
+def split_dotted_key(key: str, sep: str = ".", escape: str = None) -> list:
+    """
+    Splits a flattened key into its parts, honouring escaped separators.
+
+    Args:
+        key (str): The flattened key.
+        sep (str, optional): The separator between parts. Defaults to '.'.
+        escape (str, optional): The escape prefix used by :func:`iter_flatten`. Defaults to None.
+
+    Returns:
+        list: The key parts.
+
+    Example:
+        >>> split_dotted_key('a.b\\\\.c', escape='\\\\')
+        ['a', 'b.c']
+    """
+    if escape is None or escape not in key:
+        return key.split(sep)
+
+    parts, part, pos = [], [], 0
+    for m in _escaped_split_pattern(sep, escape).finditer(key):
+        part.append(key[pos : m.start()])
+        if m.group(1) is not None:
+            part.append(m.group(1))
+        else:
+            parts.append("".join(part))
+            part = []
+        pos = m.end()
+    part.append(key[pos:])
+    parts.append("".join(part))
+    return parts
+
+
+def iter_flatten(
+    data: _typing.Union[dict, list, tuple],
+    parent_key: str = "",
+    sep: str = ".",
+    lists: bool = False,
+    escape: str = None,
+) -> _typing.Iterator[_typing.Tuple[str, _typing.Any]]:
+    """
+    Lazily yields the (key, value) pairs of a flattened nested dictionary.
+
+    The walk uses an explicit stack, so deep documents never hit the recursion
+    limit and no intermediate dictionaries are built.
+
+    Args:
+        data (dict | list | tuple): The nested data to be flattened.
+        parent_key (str, optional): The key prefixed to every yielded key. Defaults to ''.
+        sep (str, optional): The separator used to join keys. Defaults to '.'.
+        lists (bool, optional): Also flatten lists and tuples, keyed by index. Defaults to False.
+        escape (str, optional): When set, keys are stringified and occurrences of ``sep``
+            and ``escape`` inside them are prefixed with ``escape``. Defaults to None.
+
+    Yields:
+        tuple: ``(flattened_key, value)`` pairs in depth-first order.
+
+    Example:
+        >>> list(iter_flatten({'a': {'b': 1, 'c': [2, 3]}}, lists=True))
+        [('a.b', 1), ('a.c.0', 2), ('a.c.1', 3)]
+    """
+    containers = (dict, list, tuple) if lists else dict
+
+    def items(obj):
+        return obj.items() if isinstance(obj, dict) else enumerate(obj)
+
+    stack = [(parent_key, iter(items(data)))]
+    while stack:
+        prefix, it = stack[-1]
+        for key, value in it:
+            if escape is not None:
+                key = _escape_key(str(key), sep, escape)
+            new_key = f"{prefix}{sep}{key}" if prefix else key
+            if isinstance(value, containers):
+                stack.append((new_key, iter(items(value))))
+                break
+            yield new_key, value
+        else:
+            stack.pop()
+
+
+def flatten_nested_dict(
+    data: dict,
+    parent_key: str = "",
+    sep: str = ".",
+    lists: bool = False,
+    escape: str = None,
+) -> dict:
     """
     Flattens a nested dictionary into a single-level dictionary.
 
@@ -6,6 +108,8 @@ def flatten_nested_dict(data: dict, parent_key: str = "", sep: str = ".") -> dic
         data (dict): The nested dictionary to be flattened.
         parent_key (str, optional): The parent key of the current dictionary. Defaults to ''.
         sep (str, optional): The separator used to join the parent key and the current key. Defaults to '.'.
+        lists (bool, optional): Also flatten lists and tuples, keyed by index. Defaults to False.
+        escape (str, optional): Escape prefix for separators inside keys, see :func:`iter_flatten`. Defaults to None.
 
     Returns:
         dict: The flattened dictionary.
@@ -15,22 +119,72 @@ def flatten_nested_dict(data: dict, parent_key: str = "", sep: str = ".") -> dic
         >>> flatten_nested_dict(data)
         {'a.b': 1, 'a.c.d': 2}
     """
-    items = []
-    for key, value in data.items():
-        new_key = f"{parent_key}{sep}{key}" if parent_key else key
-        if isinstance(value, dict):
-            items.extend(flatten_nested_dict(value, new_key, sep).items())
+    return dict(iter_flatten(data, parent_key, sep, lists, escape))
+
+
+def parse_dotted_items(
+    items: _typing.Iterable[_typing.Tuple[str, _typing.Any]],
+    sep: str = ".",
+    escape: str = None,
+    into: dict = None,
+) -> dict:
+    """
+    Builds a nested dictionary from a stream of (dotted key, value) pairs.
+
+    The pairs are consumed lazily, e.g. straight from :func:`iter_flatten` or
+    a file reader, and consecutive keys sharing a parent reuse its node.
+
+    Args:
+        items (Iterable): The (key, value) pairs.
+        sep (str, optional): The separator between key parts. Defaults to '.'.
+        escape (str, optional): The escape prefix used when flattening. Defaults to None.
+        into (dict, optional): The dictionary to merge the pairs into. Defaults to a new one.
+
+    Returns:
+        dict: The nested dictionary.
+
+    Example:
+        >>> parse_dotted_items(iter([('a.b', 1), ('a.c', 2)]))
+        {'a': {'b': 1, 'c': 2}}
+    """
+    result = {} if into is None else into
+    # the parent of the previous key and its node
+    last_parent = None
+    node = result
+    fast = escape is None and len(sep) == 1
+    for key, value in items:
+        if fast:
+            cut = key.rfind(sep)
+            parent, leaf = key[: max(cut, 0)], key[cut + 1 :]
+            if cut < 0:
+                parent = None
+            elif parent == last_parent:
+                node[leaf] = value
+                continue
+            parents = parent.split(sep) if parent is not None else []
         else:
-            items.append((new_key, value))
-    return dict(items)
+            *parents, leaf = split_dotted_key(key, sep, escape)
+            parent = parents
+            if parent == last_parent:
+                node[leaf] = value
+                continue
 
+        node = result
+        for k in parents:
+            node = node.setdefault(k, {})
+        last_parent = parent
+        node[leaf] = value
+    return result
 
-def parse_dotted_dict(data: dict):
+
+def parse_dotted_dict(data: dict, sep: str = ".", escape: str = None):
     """
     Parses a dictionary with dotted keys into a nested dictionary.
 
     Args:
         data (dict): The dictionary to be parsed.
+        sep (str, optional): The separator between key parts. Defaults to '.'.
+        escape (str, optional): The escape prefix used when flattening. Defaults to None.
 
     Returns:
         dict: The parsed dictionary with nested structure.
@@ -40,11 +194,4 @@ def parse_dotted_dict(data: dict):
         >>> parse_dotted_dict(data)
         {'a': {'b': 1, 'c': {'d': 2}}}
     """
-    result = {}
-    for key, value in data.items():
-        keys = key.split(".")
-        temp = result
-        for k in keys[:-1]:
-            temp = temp.setdefault(k, {})
-        temp[keys[-1]] = value
-    return result
+    return parse_dotted_items(data.items(), sep, escape)
@@ -0,0 +1,108 @@
+import typing as _typing
+
+from .traverse import del_deep, get_deep, set_deep
+
+SET = "set"
+DELETE = "delete"
+INSERT = "insert"
+
+
+def _same(a, b) -> bool:
+    return a is b or (type(a) is type(b) and a == b)
+
+
+def _diff_list(path: tuple, old: list, new: list, ops: list, pending: list):
+    size = min(len(old), len(new))
+    start = 0
+    while start < size and _same(old[start], new[start]):
+        start += 1
+    end = 0
+    while end < size - start and _same(old[-1 - end], new[-1 - end]):
+        end += 1
+
+    paired = min(len(old), len(new)) - start - end
+    for i in range(start, start + paired):
+        pending.append((path + (i,), old[i], new[i]))
+
+    at = start + paired
+    for i in range(at, len(new) - end):
+        ops.append((INSERT, path + (i,), new[i]))
+    for _ in range(at, len(old) - end):
+        ops.append((DELETE, path + (at,)))
+
+
+def diff(old, new, path: _typing.Sequence = ()) -> list:
+    """
+    Compute the operations turning ``old`` into ``new``.
+
+    Subtrees that are the same object are skipped without being compared;
+    lists are aligned on their common prefix and suffix, so a single
+    insertion or removal yields a single operation.
+
+    Args:
+        old: The previous document.
+        new: The current document.
+        path (Sequence, optional): A key prefix for every operation. Defaults to ().
+
+    Returns:
+        list: Operations for :func:`apply_patch`, each one of
+        ``("set", path, value)``, ``("delete", path)`` or
+        ``("insert", path, value)`` where ``path`` is a tuple of keys.
+        Values are shared with ``new``, not copied.
+
+    Example:
+        >>> diff({"a": 1, "b": [1, 2]}, {"a": 2, "b": [1, 3, 2]})
+        [('set', ('a',), 2), ('insert', ('b', 1), 3)]
+    """
+    ops = []
+    pending = [(tuple(path), old, new)]
+    while pending:
+        at, a, b = pending.pop()
+        if a is b:
+            continue
+        if isinstance(a, dict) and isinstance(b, dict):
+            children = []
+            for key in a:
+                if key not in b:
+                    ops.append((DELETE, at + (key,)))
+            for key, value in b.items():
+                if key not in a:
+                    ops.append((SET, at + (key,), value))
+                else:
+                    children.append((at + (key,), a[key], value))
+            pending.extend(reversed(children))
+        elif isinstance(a, list) and isinstance(b, list):
+            children = []
+            _diff_list(at, a, b, ops, children)
+            pending.extend(reversed(children))
+        elif not _same(a, b):
+            ops.append((SET, at, b))
+    return ops
+
+
+def apply_patch(obj, ops: _typing.Iterable):
+    """
+    Apply operations produced by :func:`diff` to ``obj`` in place.
+
+    Args:
+        obj: The document to patch.
+        ops (Iterable): The operations, as tuples or lists (e.g. after a JSON round trip).
+
+    Returns:
+        The patched document, which is a new object only when an operation
+        replaces the root.
+    """
+    for op, path, *value in ops:
+        path = tuple(path)
+        if op == SET:
+            if not path:
+                obj = value[0]
+            else:
+                set_deep(obj, *path, value=value[0])
+        elif op == DELETE:
+            del_deep(obj, *path)
+        elif op == INSERT:
+            get_deep(obj, *path[:-1]).insert(int(path[-1]), value[0])
+        else:
+            raise ValueError(f"Unknown patch operation: {op}")
+    return obj
@@ -1,177 +1,788 @@
-import json
+import ast
+import bisect
+import copy
+import functools
+import operator
 import re
+import sys
+import threading
+import time
 import typing
+from collections import OrderedDict
 
+# natural-language operators: the words between two operands and the
+# expression they become. ``pattern of`` takes everything up to the next
+# ``&&``/``||`` or unmatched ``)``.
 nlp_like = {
-    "(\\w+) contains (\\w+)": 'CONTAINS(\\1, "\\2")',
-    "(\\w+) is (\\w+)": '\\1 == "\\2"',
-    "(\\w+) startswith (\\w+)": '\\1.startswith("\\2")',
-    "(\\w+) endswith (\\w+)": '\\1.endswith("\\2")',
-    "(\\w+) pattern of (.*)": 'REGEX(\\1, "\\2")',
+    ("contains",): 'CONTAINS({0}, "{1}")',
+    ("is",): '{0} == "{1}"',
+    ("startswith",): '{0}.startswith("{1}")',
+    ("endswith",): '{0}.endswith("{1}")',
+    ("pattern", "of"): 'REGEX({0}, "{1}")',
 }
+_NLP_REST = {("pattern", "of")}
 
+# one alternation scans a query in a single pass; quotes have no escapes and
+# an unterminated quote runs to the end, as before
+_TOKEN = re.compile(
+    r"""(?P<string>"[^"]*"?|'[^']*'?)|(?P<space> +)|(?P<word>\w+)"""
+    r"""|(?P<logic>&&|\|\||!(?!=)|[&|])|(?P<other>.)""",
+    re.S,
+)
+_LOGIC = {"&&": "and", "&": "and", "||": "or", "|": "or", "!": "not"}
+_LOGIC_WORDS = frozenset(_LOGIC.values())
+PARSE_CACHE_SIZE = 1024
 
-def regex_func(x, y, ignore_case=True):
+
+def _glob_to_regex(y: str) -> str:
     if ".*" not in y:
         y = y.replace("*", ".*")
 
     if ".?" not in y:
         y = y.replace("?", ".?")
+    return y
+
+
+PATTERN_CACHE_SIZE = 1024
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+
+def _lowered_pattern(regex: str) -> typing.Optional[typing.Tuple[str, str]]:
+    """
+    Classify ``lit``, ``lit.*``, ``.*lit`` and ``.*lit.*`` regexes as
+    ``("eq" | "prefix" | "suffix" | "infix", lit)``, or None.
+    """
+    head = regex.startswith(".*")
+    tail = regex.endswith(".*") and len(regex) >= (4 if head else 2)
+    literal = regex[2 if head else 0 : len(regex) - 2 if tail else None]
+    if _REGEX_META.intersection(literal) or "\n" in literal:
+        return None
+    kind = ("eq", "prefix", "suffix", "infix")[tail + 2 * head]
+    return kind, literal
+
+
+def _lowered_matcher(regex: str) -> typing.Optional[typing.Callable]:
+    """
+    Lower simple regexes to string checks. ``.`` does not match newlines,
+    so any ``.*`` requires a newline-free value.
+    """
+    lowered = _lowered_pattern(regex)
+    if lowered is None:
+        return None
+
+    kind, literal = lowered
+    if kind == "eq":
+        return lambda x: x == literal
+    if kind == "infix":
+        return lambda x: literal in x and "\n" not in x
+    if kind == "prefix":
+        return lambda x: x.startswith(literal) and "\n" not in x
+    return lambda x: x.endswith(literal) and "\n" not in x
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _pattern_matcher(y: str, ignore_case: bool) -> typing.Callable:
+    """
+    Build the cached matcher of a glob-ish pattern.
+
+    Case-sensitive literal, prefix, suffix and infix patterns become plain
+    string checks; everything else is a compiled ``fullmatch``. Invalid
+    patterns never match.
+    """
+    regex = _glob_to_regex(y)
+    if not ignore_case:
+        lowered = _lowered_matcher(regex)
+        if lowered is not None:
+            return lowered
 
     try:
-        return re.fullmatch(y, x, re.IGNORECASE if ignore_case else 0) is not None
+        fullmatch = re.compile(regex, re.IGNORECASE if ignore_case else 0).fullmatch
     except re.error:
-        return False
+        return lambda x: False
+    return lambda x: fullmatch(x) is not None
+
+
+def regex_func(x, y, ignore_case=True):
+    return _pattern_matcher(y, bool(ignore_case))(x)
+
+
+def _regex(x, y, ignore_case=False):
+    return regex_func(x, y, ignore_case)
 
 
 funcs_maps = {
     "CONTAINS": lambda container, substring: substring in container,
-    "REGEX": lambda x, y, ignore_case=False: regex_func(x, y, ignore_case),
+    "REGEX": _regex,
     "REGEXI": regex_func,
 }
 
 
-def _parse_symbols_logic2(query: str):
-    in_quote = False
-    current_quote = None
-    i = 0
-    while i < len(query):
-        char = query[i]
-        if char in "\"'":
-            if not in_quote:
-                current_quote = char
-                in_quote = True
-            elif char == current_quote:
-                in_quote = False
-            i += 1
-            continue
-
-        if not in_quote and char in "&|!":
-            if char == "&":
-                query = query[:i] + " and " + query[i + 1 :]
-                i += 5
-            elif char == "|":
-                query = query[:i] + " or " + query[i + 1 :]
-                i += 4
-            elif char == "!":
-                query = query[:i] + " not " + query[i + 1 :]
-                i += 5
-        else:
-            i += 1
+# builtins callable from queries, e.g. ``len(name) > 3``
+SAFE_BUILTINS = {
+    f.__name__: f
+    for f in (abs, all, any, bool, float, int, len, max, min, round, str)
+}
 
-    return query
+# read-only methods callable on field values, e.g. ``name.lower()``
+SAFE_METHODS = frozenset(
+    (
+        "startswith", "endswith", "lower", "upper", "casefold", "title",
+        "capitalize", "strip", "lstrip", "rstrip", "split", "rsplit",
+        "replace", "count", "find", "rfind", "index", "rindex", "isalnum",
+        "isalpha", "isdecimal", "isdigit", "islower", "isnumeric",
+        "isspace", "isupper", "get", "keys", "values", "items",
+    )
+)
 
+_SAFE_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.Call,
+    ast.keyword,
+    ast.Attribute,
+    ast.Subscript,
+    ast.Slice,
+    ast.Name,
+    ast.Constant,
+    ast.List,
+    ast.Tuple,
+    ast.Set,
+    ast.Dict,
+    ast.expr_context,
+    ast.boolop,
+    ast.operator,
+    ast.unaryop,
+    ast.cmpop,
+)
 
-def _parse_symbols_logic(query: str):
-    in_quote = False
-    current_quote = None
-    i = 0
-    query_list = list(query)
-    while i < len(query_list):
-        char = query_list[i]
-        if char in "\"'":
-            if not in_quote:
-                current_quote = char
-                in_quote = True
-            elif char == current_quote:
-                in_quote = False
-            i += 1
-            continue
-
-        if not in_quote:
-            if char == "&" and i + 1 < len(query_list) and query_list[i + 1] == "&":
-                query_list[i : i + 2] = list(" and ")
-                i += 5
-            elif char == "|" and i + 1 < len(query_list) and query_list[i + 1] == "|":
-                query_list[i : i + 2] = list(" or ")
-                i += 4
-            elif char == "!":
-                query_list[i : i + 1] = list(" not ")
-                i += 5
-            else:
-                i += 1
+
+class _Record(dict):
+    """A query record whose missing fields read as undefined names."""
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        raise NameError(f"name '{key}' is not defined")
+
+
+def _undefined(name: str):
+    raise NameError(f"name '{name}' is not defined")
+
+
+class _FieldRewriter(ast.NodeTransformer):
+    """
+    Check a query against the safe-node whitelist and turn free names into
+    explicit record lookups.
+    """
+
+    def __init__(self, callables: dict):
+        self.callables = callables
+        self.fields = []
+        self.usesDefault = False
+        self.usesRecord = False
+        self.expression = None
+        # precompiled pattern matchers, by the global name they are bound to
+        self.matchers = {}
+        # (kind, literal) of the matchers lowered to string checks
+        self.patterns = {}
+        self.namespace = None
+
+    def generic_visit(self, node):
+        if not isinstance(node, _SAFE_NODES):
+            raise ValueError(f"Unsupported syntax in query: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if node.attr.startswith("_"):
+            raise ValueError(f"Private attribute access in query: {node.attr}")
+        return self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in self.callables:
+            # only a called name is a function; elsewhere it is a field
+            node.args = [self.visit(arg) for arg in node.args]
+            node.keywords = [self.visit(kw) for kw in node.keywords]
+            return self.bind_pattern(node) or node
+        if not isinstance(func, ast.Attribute) or func.attr not in SAFE_METHODS:
+            raise ValueError(f"Unsupported call in query: {ast.unparse(func)}")
+        node = self.generic_visit(node)
+        return self.bind_pattern(node) or node
+
+    def bind_pattern(self, node):
+        """
+        Replace ``REGEX(field, "literal")`` with a call to its matcher, built
+        once here instead of per record.
+        """
+        func = node.func
+        if (
+            not isinstance(func, ast.Name)
+            or self.callables.get(func.id) not in (_regex, regex_func)
+            or node.keywords
+            or len(node.args) not in (2, 3)
+            or not all(isinstance(a, ast.Constant) for a in node.args[1:])
+            or not isinstance(node.args[1].value, str)
+        ):
+            return None
+
+        ignore_case = self.callables[func.id] is regex_func
+        if len(node.args) == 3:
+            ignore_case = node.args[2].value
+        name = f"__match{len(self.matchers)}"
+        pattern = node.args[1].value
+        self.matchers[name] = _pattern_matcher(pattern, bool(ignore_case))
+        if not ignore_case:
+            lowered = _lowered_pattern(_glob_to_regex(pattern))
+            if lowered is not None:
+                self.patterns[name] = lowered
+        return ast.Call(ast.Name(name, ast.Load()), [node.args[0]], [])
+
+    def visit_Name(self, node):
+        name = node.id
+        if name == "x":
+            # the whole record, unless the record has a field named x
+            self.usesRecord = True
+            data = ast.Name("__data", ast.Load())
+            new = ast.IfExp(
+                ast.Compare(ast.Constant("x"), [ast.In()], [data]),
+                ast.Subscript(data, ast.Constant("x"), ast.Load()),
+                data,
+            )
+        elif name == "__default__":
+            self.usesDefault = True
+            new = ast.Name("__default", ast.Load())
+        elif name.startswith("_"):
+            # private fields are hidden from queries
+            new = ast.Call(
+                ast.Name("__undefined", ast.Load()), [ast.Constant(name)], []
+            )
         else:
-            i += 1
-
-    return "".join(query_list)
-
-
-def _collapse_spaces(query: str):
-    new_query = []
-    in_quote = False
-    current_quote = None
-    prev_was_space = False
-
-    for char in query:
-        if char in "\"'":
-            if not in_quote:
-                current_quote = char
-                in_quote = True
-            elif char == current_quote:
-                in_quote = False
-            new_query.append(char)
-            prev_was_space = False
-        elif in_quote:
-            new_query.append(char)
-            prev_was_space = False
+            if name not in self.fields:
+                self.fields.append(name)
+            new = ast.Subscript(
+                ast.Name("__data", ast.Load()), ast.Constant(name), ast.Load()
+            )
+        return ast.copy_location(new, node)
+
+
+def _compile_expression(expression: ast.expr, namespace: dict, label: str):
+    """Compile a rewritten expression into ``lambda __data, __default: ...``."""
+    tree = ast.Expression(
+        ast.Lambda(
+            ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg("__data"), ast.arg("__default")],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            expression,
+        )
+    )
+    ast.fix_missing_locations(tree)
+    return eval(compile(tree, f"<query {label!r}>", "eval"), namespace)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _compile_query(query: str):
+    """
+    Compile a parsed query into ``(func, rewriter)`` where
+    ``func(record, default)`` evaluates it against a :class:`_Record` and
+    the rewriter records which fields the query references.
+    """
+    callables = {**SAFE_BUILTINS, **funcs_maps}
+    rewriter = _FieldRewriter(callables)
+    rewriter.expression = rewriter.visit(ast.parse(query, mode="eval")).body
+    rewriter.namespace = {
+        "__builtins__": {},
+        "__undefined": _undefined,
+        **callables,
+        **rewriter.matchers,
+    }
+    func = _compile_expression(rewriter.expression, rewriter.namespace, query)
+    return func, rewriter
+
+
+# ANCHOR columnar evaluation
+class _NotVectorizable(Exception):
+    pass
+
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: operator.contains(b, a),
+    ast.NotIn: lambda a, b: not operator.contains(b, a),
+}
+
+
+def _numpy(columns: dict):
+    """Return numpy if any column is an ndarray, without importing it."""
+    np = sys.modules.get("numpy")
+    if np is not None and any(isinstance(c, np.ndarray) for c in columns.values()):
+        return np
+    return None
+
+
+class _Scalar:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _ColumnEvaluator:
+    """
+    Evaluate a compiled query tree over whole columns at once.
+
+    Vectors are lists, or ndarrays when numpy columns are involved, and masks
+    are bool ndarrays when numpy is in use. Anything outside the supported
+    subset raises :class:`_NotVectorizable`.
+    """
+
+    def __init__(self, columns: dict, size: int, default, np, matchers: dict):
+        self.columns = columns
+        self.matchers = matchers
+        self.size = size
+        self.default = default
+        self.np = np
+        self.normalized = {}
+
+    def column(self, name: str):
+        """A column with ints/floats turned into str, as in ``validate``."""
+        if name in self.normalized:
+            return self.normalized[name]
+        if name not in self.columns:
+            raise _NotVectorizable(name)
+
+        col = self.columns[name]
+        np = self.np
+        if np is not None and isinstance(col, np.ndarray):
+            if col.dtype.kind in "biuf":
+                col = col.astype(str)
+            elif col.dtype.kind == "O":
+                col = np.array(
+                    [str(v) if isinstance(v, (int, float)) else v for v in col],
+                    dtype=object,
+                )
         else:
-            if char == " ":
-                if not prev_was_space:
-                    new_query.append(" ")
-                prev_was_space = True
-            else:
-                new_query.append(char)
-                prev_was_space = False
+            col = [str(v) if isinstance(v, (int, float)) else v for v in col]
+        self.normalized[name] = col
+        return col
 
-    return "".join(new_query)
+    def vector(self, values) -> typing.Any:
+        if self.np is not None:
+            return self.np.fromiter(values, dtype=bool, count=self.size)
+        return list(values)
 
+    def broadcast(self, value):
+        if isinstance(value, _Scalar):
+            return _repeat(value.value, self.size)
+        return value
 
-class QueryObj:
-    @classmethod
-    def parse(cls, query: str):
-        stats = {"isCompound": False, "simple": False}
-
-        # if theres no space in query, consider it as a regex pattern
-        if " " not in query and "(" not in query:
-            query = 'REGEX(__default__, "{query}")'.replace("{query}", query)
-            stats["simple"] = True
-        elif " and " in query or " or " in query or "not " in query:
-            stats["isCompound"] = True
-        elif (
-            any(char in query for char in ["&&", "||", "!"])
-            and (query2 := _parse_symbols_logic(query)) != query
+    def truth(self, value):
+        if isinstance(value, _Scalar):
+            return self.vector(_repeat(bool(value.value), self.size))
+        if self.np is not None and isinstance(value, self.np.ndarray):
+            return value.astype(bool) if value.dtype != bool else value
+        return self.vector(map(bool, value))
+
+    def map(self, func, *args):
+        if all(isinstance(a, _Scalar) for a in args):
+            return _Scalar(func(*(a.value for a in args)))
+        return list(map(func, *(self.broadcast(a) for a in args)))
+
+    def eval(self, node):
+        method = getattr(self, "eval_" + type(node).__name__, None)
+        if method is None:
+            raise _NotVectorizable(type(node).__name__)
+        return method(node)
+
+    def eval_Constant(self, node):
+        return _Scalar(node.value)
+
+    def eval_Name(self, node):
+        if node.id == "__default":
+            return self.default
+        raise _NotVectorizable(node.id)
+
+    def eval_Subscript(self, node):
+        if (
+            isinstance(node.value, ast.Name)
+            and node.value.id == "__data"
+            and isinstance(node.slice, ast.Constant)
         ):
-            stats["isCompound"] = True
-            query = query2
-        elif (
-            any(char in query for char in "&|!")
-            and (query2 := _parse_symbols_logic2(query)) != query
+            return self.column(node.slice.value)
+        raise _NotVectorizable("subscript")
+
+    def eval_BoolOp(self, node):
+        masks = [self.truth(self.eval(v)) for v in node.values]
+        np = self.np
+        if np is not None:
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = masks[0]
+            for mask in masks[1:]:
+                result = combine(result, mask)
+            return result
+        combine = all if isinstance(node.op, ast.And) else any
+        return self.vector(map(lambda *row: combine(row), *masks))
+
+    def eval_UnaryOp(self, node):
+        if not isinstance(node.op, ast.Not):
+            raise _NotVectorizable("unary")
+        mask = self.truth(self.eval(node.operand))
+        if self.np is not None:
+            return self.np.logical_not(mask)
+        return [not v for v in mask]
+
+    def eval_Compare(self, node):
+        if len(node.ops) != 1 or type(node.ops[0]) not in _COMPARE_OPS:
+            raise _NotVectorizable("compare")
+        op = _COMPARE_OPS[type(node.ops[0])]
+        left = self.eval(node.left)
+        right = self.eval(node.comparators[0])
+        np = self.np
+        if (
+            np is not None
+            and type(node.ops[0]) not in (ast.In, ast.NotIn)
+            and not isinstance(left, list)
+            and not isinstance(right, list)
         ):
-            stats["isCompound"] = True
-            query = query2
+            # elementwise ufunc comparison
+            return op(
+                left.value if isinstance(left, _Scalar) else left,
+                right.value if isinstance(right, _Scalar) else right,
+            )
+        return self.map(op, left, right)
+
+    def eval_Call(self, node):
+        if node.keywords:
+            raise _NotVectorizable("keywords")
+        args = [self.eval(a) for a in node.args]
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            return self.method(self.eval(func.value), func.attr, args)
+        if func.id in self.matchers:
+            return self.map(self.matchers[func.id], *args)
+        if func.id == "CONTAINS" and len(args) == 2:
+            return self.contains(*args)
+        if func.id in ("REGEX", "REGEXI") and isinstance(args[1], _Scalar):
+            ignore_case = func.id == "REGEXI"
+            if len(args) == 3 and isinstance(args[2], _Scalar):
+                ignore_case = args[2].value
+            elif len(args) != 2:
+                raise _NotVectorizable("regex")
+            return self.regex(args[0], args[1].value, ignore_case)
+        if func.id in SAFE_BUILTINS:
+            return self.map(SAFE_BUILTINS[func.id], *args)
+        raise _NotVectorizable(func.id)
+
+    def method(self, target, name: str, args: list):
+        if not all(isinstance(a, _Scalar) for a in args):
+            raise _NotVectorizable("method")
+        values = [a.value for a in args]
+        np = self.np
+        if (
+            np is not None
+            and isinstance(target, np.ndarray)
+            and target.dtype.kind == "U"
+            and name in ("startswith", "endswith")
+            and len(values) == 1
+        ):
+            return getattr(np.char, name)(target, values[0])
+        return self.map(operator.methodcaller(name, *values), target)
+
+    def contains(self, container, substring):
+        np = self.np
+        if (
+            np is not None
+            and isinstance(container, np.ndarray)
+            and container.dtype.kind == "U"
+            and isinstance(substring, _Scalar)
+            and isinstance(substring.value, str)
+        ):
+            return np.char.find(container, substring.value) >= 0
+        return self.map(lambda c, s: s in c, container, substring)
+
+    def regex(self, target, pattern: str, ignore_case: bool):
+        return self.map(_pattern_matcher(pattern, bool(ignore_case)), target)
+
+
+def _repeat(value, size: int):
+    return [value] * size
+
+
+_MISSING = object()
+
+CACHE_POLICIES = ("none", "lru", "ttl")
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_TTL = 60.0
+
+
+class QueryCache:
+    """
+    A thread-safe, bounded LRU of query results with an optional TTL.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = None):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 4096.
+            ttl (float, optional): Seconds an entry stays valid, None for no
+                expiry. Defaults to None.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+def _make_cache(cache) -> typing.Optional[QueryCache]:
+    if cache is None or cache is False or cache == "none":
+        return None
+    if isinstance(cache, QueryCache):
+        return cache
+    if cache == "lru":
+        return QueryCache()
+    if cache == "ttl":
+        return QueryCache(ttl=DEFAULT_CACHE_TTL)
+    raise ValueError(f"cache must be a QueryCache or one of {CACHE_POLICIES}")
+
+
+def _tokenize(query: str) -> typing.List[typing.Tuple[str, str, int]]:
+    """Split a query into ``(kind, text, offset)`` tokens."""
+    return [(m.lastgroup, m.group(), m.start()) for m in _TOKEN.finditer(query)]
+
+
+def _match_nlp(tokens: list, i: int) -> typing.Optional[tuple]:
+    """
+    Match a natural-language operator after the word at ``tokens[i]``.
+    Returns ``(phrase, end)`` where ``tokens[end]`` is the right operand.
+    """
+    for phrase in nlp_like:
+        at = i
+        for word in phrase:
+            if (
+                at + 2 >= len(tokens)
+                or tokens[at + 1][1] != " "
+                or tokens[at + 2][1] != word
+            ):
+                break
+            at += 2
+        else:
+            if at + 1 < len(tokens) and tokens[at + 1][1] == " ":
+                if phrase in _NLP_REST:
+                    return phrase, at + 1
+                if at + 2 < len(tokens) and tokens[at + 2][0] == "word":
+                    return phrase, at + 2
+    return None
+
+
+def _rest_end(tokens: list, i: int) -> int:
+    """
+    Index of the token ending a :data:`_NLP_REST` operand starting at ``i``:
+    the next ``&&``/``||`` or unmatched ``)``, else ``len(tokens)``.
+    """
+    depth = 0
+    for j in range(i, len(tokens)):
+        text = tokens[j][1]
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            if not depth:
+                return j
+            depth -= 1
+        elif not depth and text in ("&&", "||"):
+            return j
+    return len(tokens)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_query(query: str) -> typing.Tuple[str, bool, bool]:
+    """
+    Normalize a query in one pass over its tokens.
+
+    Returns ``(expression, isCompound, simple)``; the expression is interned
+    so equal queries share one string.
+    """
+    # if theres no space in query, consider it as a regex pattern
+    if " " not in query and "(" not in query:
+        return sys.intern(f'REGEX(__default__, "{query}")'), False, True
+
+    tokens = _tokenize(query)
+    out = []
+    compound = False
+
+    def space():
+        if out and out[-1] != " ":
+            out.append(" ")
+
+    i = 0
+    while i < len(tokens):
+        kind, text, _ = tokens[i]
+        if kind == "space":
+            space()
+        elif kind == "logic":
+            compound = True
+            space()
+            out.append(_LOGIC[text])
+            out.append(" ")
+        elif kind == "word" and (match := _match_nlp(tokens, i)):
+            phrase, end = match
+            if phrase in _NLP_REST:
+                # the operand is verbatim, so it may hold spaces, "|" and groups
+                stop = _rest_end(tokens, end + 1)
+                stopAt = tokens[stop][2] if stop < len(tokens) else len(query)
+                operand = query[tokens[end][2] + 1 : stopAt].rstrip()
+                end = stop - 1
+            else:
+                operand = tokens[end][1]
+            out.append(nlp_like[phrase].format(text, operand))
+            i = end
+        else:
+            compound = compound or text in _LOGIC_WORDS
+            out.append(text)
+        i += 1
 
-        # match all the nlp like queries and replace them to correct value
-        if not stats["simple"]:
-            for pattern, replacement in nlp_like.items():
-                query = re.sub(pattern, replacement, query)
+    return sys.intern("".join(out).strip()), compound, False
 
-        # Collapse multiple spaces outside quotes
-        query = _collapse_spaces(query)
-        query = query.strip()
 
-        return QueryObj(query, stats)
+def _to_record(obj: typing.Any) -> typing.Optional[_Record]:
+    def _func(obj):
 
-    def __init__(self, query: str, stats: dict, verify : bool = True):
+        if isinstance(obj, (list, tuple, int, float, bool, str)):
+            return {"value": obj}
+
+        if isinstance(obj, dict):
+            return obj
+
+        if hasattr(obj, "__dict__"):
+            return {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
+
+    res = _func(obj)
+    if res is None:
+        return None
+
+    return _Record(
+        {k: str(v) if isinstance(v, (int, float)) else v for k, v in res.items()}
+    )
+
+
+def _default_of(data: dict):
+    """The value ``__default__`` stands for in a record."""
+    default = data.get("__default__", None)
+
+    if default is None:
+        if "name" in data:
+            default = data["name"]
+        elif "id" in data:
+            default = data["id"]
+        else:
+            default = next(iter(data.keys()))
+    return default
+
+
+class QueryObj:
+    @classmethod
+    def parse(cls, query: str, **kwargs):
+        """
+        Parse a query written with ``and``/``&&``, ``or``/``||``,
+        ``not``/``!`` and the :data:`nlp_like` operators, e.g.
+        ``name is John && bio contains engineer``. A query without spaces or
+        calls is a pattern matched against the default field.
+
+        Parsing and compiling are cached per query string, so a repeated
+        query only builds its :class:`QueryObj`.
+        """
+        query, compound, simple = _parse_query(query)
+        stats = {"isCompound": compound, "simple": simple}
+        return QueryObj(query, stats, **kwargs)
+
+    def __init__(
+        self,
+        query: str,
+        stats: dict,
+        verify: bool = True,
+        cache: typing.Union[str, QueryCache, None] = "lru",
+    ):
+        """
+        Args:
+            query (str): The parsed query expression.
+            stats (dict): The parse stats.
+            verify (bool, optional): Evaluate the query once to reject invalid
+                queries early. Defaults to True.
+            cache (str | QueryCache | None, optional): The result cache policy:
+                ``"lru"`` (bounded LRU), ``"ttl"`` (LRU whose entries expire),
+                ``"none"``/None, or a :class:`QueryCache` to share or tune.
+                Results are keyed on the fields the query references.
+                Defaults to "lru".
+        """
         self.query = query
         self.stats = stats
-        self.__objectSerializable = None
-        self.__cache = {}
+        self.__cache = _make_cache(cache)
+        try:
+            self.__compiled, info = _compile_query(query)
+        except (SyntaxError, ValueError) as e:
+            raise ValueError(f"Invalid query: {self.query}") from e
+        self.fields = tuple(info.fields)
+        self.__usesDefault = info.usesDefault
+        self.__usesRecord = info.usesRecord
+        self.__expression = info.expression
+        self.__matchers = info.matchers
+        self.__info = info
+        self.__plan = None
         self.__cachedFunc = self.__func_maker()
         self.__defaultKey = None
 
         if verify:
             try:
-                self.validate({"test" : "test"})
+                self.__cachedFunc(self.__toDictRepresentation({"test": "test"}))
             except NameError:
                 pass
             except Exception as e:
@@ -188,78 +799,553 @@ class QueryObj:
 
 
     def __toDictRepresentation(self, obj: typing.Any):
-        def _func(obj):
+        return _to_record(obj)
 
-            if isinstance(obj, (list, tuple, int, float, bool, str)):
-                return {"value": obj}
+    @property
+    def cache(self) -> typing.Optional[QueryCache]:
+        return self.__cache
 
-            if isinstance(obj, dict):
-                return obj
+    __default = staticmethod(_default_of)
 
-            if hasattr(obj, "__dict__"):
-                return {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
+    def __func_maker(self):
+        compiled = self.__compiled
+        resolveDefault = self.__default if self.__usesDefault else None
 
-        res = _func(obj)
-        if res is None:
+        def func(data: dict, default=_MISSING):
+            if default is _MISSING:
+                default = resolveDefault(data) if resolveDefault else None
+
+            try:
+                return compiled(data, default)
+            except NameError:
+                return False
+
+        return func
+
+    def __toCacheKey(self, rep: dict, default) -> typing.Optional[tuple]:
+        """
+        Key a record by the values of the fields the query reads, or return
+        None when they are unhashable.
+        """
+        # the query is part of the key so one QueryCache can be shared
+        if self.__usesRecord:
+            key = (self.query, *rep.items())
+        else:
+            key = (self.query, *[rep.get(field, _MISSING) for field in self.fields])
+        if self.__usesDefault:
+            key += (default,)
+        try:
+            hash(key)
+        except TypeError:
             return None
+        return key
 
-        return {k: str(v) if isinstance(v, (int, float)) else v for k, v in res.items()}
+    def filter(self, iterable: typing.Iterable) -> typing.Iterator:
+        """
+        Lazily yield the items of ``iterable`` matching the query.
+        """
+        validate = self.validate
+        for obj in iterable:
+            if validate(obj):
+                yield obj
 
-    def __toCacheKey(self, obj: typing.Any):
-        if isinstance(obj, (tuple, int, float, bool, str)):
-            return obj
+    def __columnDefault(self, ev: "_ColumnEvaluator", columns: dict):
+        if "__default__" in columns:
+            raise _NotVectorizable("__default__")
+        if "name" in columns:
+            return ev.column("name")
+        if "id" in columns:
+            return ev.column("id")
+        return _Scalar(next(iter(columns)))
+
+    def mask(self, columns: dict):
+        """
+        Evaluate the query over columnar data in bulk.
+
+        Comparisons, ``startswith``/``endswith``, ``CONTAINS`` and
+        ``REGEX``/``REGEXI`` are evaluated a column at a time (with numpy
+        ufuncs when the columns are ndarrays). Queries outside that subset,
+        missing columns, or evaluation errors fall back to :meth:`validate`
+        per row, so the result always matches it.
+
+        Args:
+            columns (dict): Maps field names to equally long lists or arrays.
 
+        Returns:
+            list | numpy.ndarray: One bool per row, an ndarray when any
+            column is an ndarray.
+
+        Example:
+            >>> QueryObj.parse("name startswith J").mask({"name": ["Jo", "Al"]})
+            [True, False]
+        """
+        sizes = {len(col) for col in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All columns must have the same length")
+        size = sizes.pop() if sizes else 0
+        np = _numpy(columns)
+
+        ev = _ColumnEvaluator(columns, size, None, np, self.__matchers)
         try:
-            return json.dumps(obj)
-        except:  # noqa
+            if self.__usesRecord:
+                raise _NotVectorizable("x")
+            if self.__usesDefault and size:
+                ev.default = self.__columnDefault(ev, columns)
+            return ev.truth(ev.eval(self.__expression))
+        except Exception:
             pass
 
-    def __func_maker(self):
-        def func(data: dict):
-            default = data.get("__default__", None)
+        names = list(columns)
+        cols = [c.tolist() if hasattr(c, "tolist") else c for c in columns.values()]
+        rows = (dict(zip(names, values)) for values in zip(*cols))
+        return ev.vector(bool(self.validate(row)) for row in rows)
 
-            if default is None:
-                if "name" in data:
-                    default = data["name"]
-                elif "id" in data:
-                    default = data["id"]
-                else:
-                    default = next(iter(data.keys()))
+    def _prepare(self, obj: typing.Any) -> tuple:
+        """Return the ``(record, default)`` pair the query is evaluated on."""
+        rep = self.__toDictRepresentation(obj)
+        return rep, (self.__default(rep) if self.__usesDefault else None)
 
+    def _evaluate(self, rep: dict, default) -> typing.Any:
+        return self.__cachedFunc(rep, default)
 
-            try:
-                return eval(
-                    self.query,
-                    {
-                        **funcs_maps,
-                        "x": data,
-                        **{k: v for k, v in data.items() if not k.startswith("_")},
-                        "__default__": default,
-                    },
+    def _compiled(self) -> tuple:
+        """Return the rewritten expression and the namespace it runs in."""
+        return self.__expression, self.__info.namespace, self.__usesDefault
+
+    def plan(self) -> "QueryPlan":
+        """
+        Return the :class:`QueryPlan` of this query, created on first use so
+        its learned clause statistics persist.
+        """
+        if self.__plan is None:
+            expression = self.__expression
+            parts = [expression]
+            if isinstance(expression, ast.BoolOp) and isinstance(
+                expression.op, ast.And
+            ):
+                parts = expression.values
+
+            clauses = []
+            for part in parts:
+                source = ast.unparse(part)
+                clauses.append(
+                    _Clause(
+                        source,
+                        part,
+                        _compile_expression(part, self.__info.namespace, source),
+                        _index_hint(part, self.__info.patterns),
+                    )
                 )
+            self.__plan = QueryPlan(self, clauses, self.__info.namespace)
+        return self.__plan
+
+    def validate(self, obj: typing.Any):
+        rep = self.__toDictRepresentation(obj)
+        cache = self.__cache
+        if cache is None:
+            return self.__cachedFunc(rep)
+
+        default = self.__default(rep) if self.__usesDefault else None
+        cacheKey = self.__toCacheKey(rep, default)
+        if cacheKey is None:
+            return self.__cachedFunc(rep, default)
+
+        result = cache.get(cacheKey, _MISSING)
+        if result is _MISSING:
+            result = self.__cachedFunc(rep, default)
+            cache.put(cacheKey, result)
+        return result
+
+
+# ANCHOR planning and indexes
+def _field_of(node: ast.expr) -> typing.Optional[str]:
+    if (
+        isinstance(node, ast.Subscript)
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "__data"
+        and isinstance(node.slice, ast.Constant)
+    ):
+        return node.slice.value
+    return None
+
+
+def _index_hint(node: ast.expr, patterns: dict) -> typing.Optional[tuple]:
+    """
+    Return ``("eq" | "prefix", field, literal)`` when a clause only matches
+    records whose field equals or starts with a literal.
+    """
+    if (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and isinstance(node.ops[0], ast.Eq)
+    ):
+        left, right = node.left, node.comparators[0]
+        if isinstance(left, ast.Constant):
+            left, right = right, left
+        field = _field_of(left)
+        if field is not None and isinstance(right, ast.Constant):
+            return "eq", field, right.value
+
+    if isinstance(node, ast.Call) and len(node.args) == 1 and not node.keywords:
+        func, (arg,) = node.func, node.args
+        if (
+            isinstance(func, ast.Attribute)
+            and func.attr == "startswith"
+            and _field_of(func.value) is not None
+            and isinstance(arg, ast.Constant)
+            and isinstance(arg.value, str)
+        ):
+            return "prefix", _field_of(func.value), arg.value
+        if isinstance(func, ast.Name) and func.id in patterns:
+            kind, literal = patterns[func.id]
+            if kind in ("eq", "prefix") and _field_of(arg) is not None:
+                return kind, _field_of(arg), literal
+    return None
+
+
+class _Clause:
+    __slots__ = ("source", "node", "func", "hint", "calls", "passes", "cost")
+
+    def __init__(
+        self,
+        source: str,
+        node: ast.expr,
+        func: typing.Callable,
+        hint: typing.Optional[tuple],
+    ):
+        self.source = source
+        self.node = node
+        self.func = func
+        self.hint = hint
+        self.calls = 0
+        self.passes = 0
+        self.cost = 0
+
+    def rank(self) -> float:
+        """Expected cost per rejected record; cheap, selective clauses first."""
+        if not self.calls:
+            return 0.0
+        rejectRate = 1 - self.passes / self.calls
+        return (self.cost / self.calls) / max(rejectRate, 0.01)
+
+    def __repr__(self):
+        return f"<clause {self.source!r} calls={self.calls} passes={self.passes}>"
+
+
+class QueryPlan:
+    """
+    Evaluates the top-level ``and`` clauses of a query in a learned order.
+
+    One record in ``SAMPLE_INTERVAL`` runs every clause with timing to learn
+    its cost and pass rate; every ``REORDER_INTERVAL`` records the clauses
+    are re-sorted so cheap, selective ones run first. Results match
+    :meth:`QueryObj.validate` (as booleans): a clause raising anything but
+    ``NameError`` re-runs the query in its written order.
+    """
+
+    SAMPLE_INTERVAL = 64
+    REORDER_INTERVAL = 1024
+
+    def __init__(self, query: "QueryObj", clauses: list, namespace: dict):
+        self.query = query
+        self.clauses = clauses
+        self.evaluations = 0
+        self.__namespace = namespace
+        self.__func = self.__combine(clauses)
+
+    def __combine(self, clauses: list) -> typing.Callable:
+        """Compile the clauses, in order, into one short-circuiting ``and``."""
+        if len(clauses) == 1:
+            return clauses[0].func
+        node = ast.BoolOp(ast.And(), [clause.node for clause in clauses])
+        return _compile_expression(node, self.__namespace, "plan")
+
+    def reorder(self):
+        clauses = sorted(self.clauses, key=_Clause.rank)
+        if clauses != self.clauses:
+            # rebinding keeps concurrent evaluations on a consistent order
+            self.__func = self.__combine(clauses)
+            self.clauses = clauses
+
+    def __sample(self, rep: dict, default) -> bool:
+        result = True
+        for clause in self.clauses:
+            start = time.perf_counter_ns()
+            try:
+                ok = clause.func(rep, default)
             except NameError:
-                return False
+                ok = result = False
+            except Exception:
+                return bool(self.query._evaluate(rep, default))
+            clause.cost += time.perf_counter_ns() - start
+            clause.calls += 1
+            if ok:
+                clause.passes += 1
+            else:
+                result = False
+        return result
 
-        return func
+    def validate(self, obj: typing.Any) -> bool:
+        rep, default = self.query._prepare(obj)
+        count = self.evaluations
+        self.evaluations = count + 1
+        if count % self.SAMPLE_INTERVAL == 0:
+            if count and count % self.REORDER_INTERVAL == 0:
+                self.reorder()
+            return self.__sample(rep, default)
 
-    def validate(self, obj: typing.Any):
-        if self.__objectSerializable is None:
-            self.__objectSerializable = self.__toCacheKey(obj) is not None
+        try:
+            return bool(self.__func(rep, default))
+        except NameError:
+            return False
+        except Exception:
+            return bool(self.query._evaluate(rep, default))
 
-        if self.__objectSerializable and self.__cache is None:
-            self.__cache = {}
+    def filter(self, iterable: typing.Iterable) -> typing.Iterator:
+        """
+        Lazily yield the items of ``iterable`` matching the query.
+        """
+        validate = self.validate
+        for obj in iterable:
+            if validate(obj):
+                yield obj
 
-        rep = self.__toDictRepresentation(obj)
 
-        if not self.__objectSerializable:
-            return self.__cachedFunc(rep)
+class QueryIndex:
+    """
+    Hash and prefix indexes over a collection of records.
+
+    :meth:`search` narrows the candidates with the equality and
+    ``startswith`` (or prefix pattern) clauses of a query's top-level
+    ``and``, then checks only those candidates with the query's
+    :class:`QueryPlan`. Field indexes are built lazily on first use; build a
+    new index after mutating the records.
+    """
+
+    def __init__(self, records: typing.Iterable):
+        self.records = list(records)
+        self._reps = None
+        self._hash = {}
+        self._prefix = {}
+
+    def _values(self, field: str):
+        if self._reps is None:
+            self._reps = [_to_record(r) for r in self.records]
+        for i, rep in enumerate(self._reps):
+            if rep is not None and field in rep:
+                yield i, rep[field]
+
+    def hash_index(self, field: str) -> dict:
+        index = self._hash.get(field)
+        if index is None:
+            index = {}
+            for i, value in self._values(field):
+                try:
+                    index.setdefault(value, []).append(i)
+                except TypeError:  # unhashable values never equal a literal key
+                    pass
+            self._hash[field] = index
+        return index
+
+    def prefix_index(self, field: str) -> tuple:
+        index = self._prefix.get(field)
+        if index is None:
+            pairs = sorted(
+                (value, i)
+                for i, value in self._values(field)
+                if isinstance(value, str)
+            )
+            index = self._prefix[field] = (
+                [value for value, _ in pairs],
+                [i for _, i in pairs],
+            )
+        return index
+
+    def candidates(self, kind: str, field: str, literal) -> typing.List[int]:
+        if kind == "eq":
+            try:
+                return self.hash_index(field).get(literal, [])
+            except TypeError:
+                return []
+
+        keys, ids = self.prefix_index(field)
+        start = end = bisect.bisect_left(keys, literal)
+        while end < len(keys) and keys[end].startswith(literal):
+            end += 1
+        return ids[start:end]
+
+    def search(self, query: "QueryObj") -> list:
+        """
+        Return the records matching ``query``, in collection order.
+        """
+        plan = query.plan()
+        hints = [clause.hint for clause in plan.clauses if clause.hint]
+        if hints:
+            found = sorted((self.candidates(*hint) for hint in hints), key=len)
+            ids = set(found[0])
+            for other in found[1:]:
+                ids.intersection_update(other)
+            ids = sorted(ids)
+        else:
+            ids = range(len(self.records))
+
+        records = self.records
+        return [records[i] for i in ids if plan.validate(records[i])]
+
+
+# ANCHOR query sets
+class _Raised:
+    """A predicate that raised; testing its truth re-raises the error."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+    def __bool__(self):
+        raise self.error
+
+
+class _SetCompiler(ast.NodeTransformer):
+    """
+    Split the queries of a :class:`QuerySet` into distinct predicates and
+    distinct field reads.
+    """
+
+    def __init__(self):
+        self.predicates = {}
+        self.fields = {}
+        self.matchers = {}
+        self.namespace = {
+            "__builtins__": {},
+            "__Raised": _Raised,
+            "Exception": Exception,
+            "NameError": NameError,
+        }
+
+    def add(self, query: "QueryObj") -> ast.expr:
+        """Return the query's expression over the shared predicate names."""
+        expression, namespace, _ = query._compiled()
+        for name, value in namespace.items():
+            if name.startswith("__match"):
+                # the same pattern is the same cached matcher in every query
+                shared = self.matchers.setdefault(
+                    id(value), f"__match{len(self.matchers)}"
+                )
+                self.namespace[shared] = value
+            else:
+                self.namespace.setdefault(name, value)
+        self.local = namespace
+        return self.combine(expression)
+
+    def combine(self, node: ast.expr) -> ast.expr:
+        if isinstance(node, ast.BoolOp):
+            return ast.BoolOp(node.op, [self.combine(v) for v in node.values])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ast.UnaryOp(node.op, self.combine(node.operand))
+        predicate = ast.unparse(self.visit(copy.deepcopy(node)))
+        name = self.predicates.setdefault(
+            predicate, f"__p{len(self.predicates)}"
+        )
+        return ast.Name(name, ast.Load())
+
+    def visit_Name(self, node):
+        if node.id.startswith("__match"):
+            shared = self.matchers[id(self.local[node.id])]
+            return ast.copy_location(ast.Name(shared, ast.Load()), node)
+        return node
+
+    def visit_Subscript(self, node):
+        field = _field_of(node)
+        if field is None:
+            return self.generic_visit(node)
+        name = self.fields.setdefault(field, f"__f{len(self.fields)}")
+        return ast.copy_location(ast.Name(name, ast.Load()), node)
+
+
+class QuerySet:
+    """
+    Many queries matched against a record in one pass.
+
+    The queries are compiled into a single function that reads each
+    referenced field once and evaluates each distinct predicate (a
+    comparison or call, after the ``and``/``or``/``not`` structure is
+    removed) once, so the cost of a record grows with the number of
+    distinct predicates rather than queries. The results match
+    :meth:`QueryObj.validate`: a query is False when it reaches a missing
+    field, and other errors propagate when the query reaches them.
+
+    Example:
+        >>> rules = QuerySet(["kind is error", "kind is error and code is 500"])
+        >>> rules.match({"kind": "error", "code": 404})
+        1
+    """
+
+    def __init__(self, queries: typing.Iterable[typing.Union["QueryObj", str]]):
+        """
+        Args:
+            queries (Iterable[QueryObj | str]): The queries, strings are
+                parsed with :meth:`QueryObj.parse`. Bit ``i`` of a match
+                stands for ``queries[i]``.
+        """
+        self.queries = [
+            QueryObj.parse(q, cache="none") if isinstance(q, str) else q
+            for q in queries
+        ]
+        compiler = _SetCompiler()
+        tests = [compiler.add(q) for q in self.queries]
+        self.usesDefault = any(q._compiled()[2] for q in self.queries)
+        self.predicates = tuple(compiler.predicates)
+        self.fields = tuple(compiler.fields)
+
+        lines = ["def __match_set(__data, __default):"]
+        for field, name in compiler.fields.items():
+            lines += [
+                "    try:",
+                f"        {name} = __data[{field!r}]",
+                "    except NameError:",
+                "        pass",
+            ]
+        for predicate, name in compiler.predicates.items():
+            # a missing field leaves its local unbound: UnboundLocalError is
+            # a NameError, raised exactly where validate() would raise it
+            lines += [
+                "    try:",
+                f"        {name} = {predicate}",
+                "    except Exception as __e:",
+                f"        {name} = __Raised(__e)",
+            ]
+        lines.append("    __mask = 0")
+        for i, test in enumerate(tests):
+            lines += [
+                "    try:",
+                f"        if {ast.unparse(test)}:",
+                f"            __mask |= {1 << i}",
+                "    except NameError:",
+                "        pass",
+            ]
+        lines.append("    return __mask")
+
+        namespace = compiler.namespace
+        exec(compile("\n".join(lines), "<query set>", "exec"), namespace)
+        self.__func = namespace.pop("__match_set")
+
+    def __len__(self):
+        return len(self.queries)
 
-        cacheKey = self.__toCacheKey(rep)
-        if cacheKey in self.__cache:
-            return self.__cache[cacheKey]
+    def match(self, obj: typing.Any) -> int:
+        """
+        Return the bitmask of the queries matching ``obj``: bit ``i`` is set
+        when ``queries[i]`` matches.
+        """
+        rep = _to_record(obj)
+        default = _default_of(rep) if self.usesDefault else None
+        return self.__func(rep, default)
 
-        self.__cache[cacheKey] = self.__cachedFunc(rep)
-        return self.__cache[cacheKey]
+    def matching(self, obj: typing.Any) -> typing.List["QueryObj"]:
+        """Return the queries matching ``obj``, in order."""
+        mask = self.match(obj)
+        return [q for i, q in enumerate(self.queries) if mask >> i & 1]
 
 
-__all__ = ["QueryObj"]
+__all__ = ["QueryObj", "QueryCache", "QueryPlan", "QueryIndex", "QuerySet"]
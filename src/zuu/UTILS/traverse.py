@@ -1,5 +1,8 @@
+import functools as _functools
 import typing as _typing
 
+_MISSING = object()
+
 
 def _traverse(obj: _typing.Union[dict, list, set, tuple], keys, create_missing=False):
     """
@@ -69,7 +72,10 @@ def set_deep(obj: _typing.Union[dict, list, set, tuple], *keys, value):
         None
     """
     *initial_keys, final_key = keys
-    curr = _traverse(obj, initial_keys, create_missing=True)
+    _set_final(_traverse(obj, initial_keys, create_missing=True), final_key, value)
+
+
+def _set_final(curr, final_key, value):
     if isinstance(curr, dict):
         curr[final_key] = value
     elif isinstance(curr, list):
@@ -93,7 +99,10 @@ def del_deep(obj: _typing.Union[dict, list, set, tuple], *keys):
         None
     """
     *initial_keys, final_key = keys
-    curr = _traverse(obj, initial_keys)
+    _del_final(_traverse(obj, initial_keys), final_key)
+
+
+def _del_final(curr, final_key):
     if isinstance(curr, dict):
         del curr[final_key]
     elif isinstance(curr, list):
@@ -119,8 +128,12 @@ def set_default_deep(
         None
     """
     *initial_keys, final_key = keys
-    curr = _traverse(obj, initial_keys, create_missing=True)
+    _set_default_final(
+        _traverse(obj, initial_keys, create_missing=True), final_key, value, fillpadding
+    )
+
 
+def _set_default_final(curr, final_key, value, fillpadding):
     if isinstance(curr, set):
         raise IndexError("set does not support default value")
 
@@ -138,3 +151,340 @@ def set_default_deep(
     else:
         if not hasattr(curr, final_key):
             setattr(curr, final_key, value)
+
+
+# ANCHOR compiled paths
+
+
+def _step(cls: type, key, create_missing: bool) -> _typing.Callable:
+    """
+    Build the accessor of one path step for containers of type ``cls``,
+    with the same semantics as the matching branch of :func:`_traverse`.
+    """
+    if issubclass(cls, dict):
+
+        def step(curr):
+            if create_missing and key not in curr:
+                curr[key] = {}
+            curr = curr.get(key)
+            if curr is None:
+                raise KeyError(f"Key {key} not found in dictionary")
+            return curr
+
+    elif issubclass(cls, list):
+        index = int(key)
+
+        def step(curr):
+            if create_missing and index >= len(curr):
+                curr.extend([{}] * (index - len(curr) + 1))
+            try:
+                return curr[index]
+            except IndexError:
+                raise KeyError(f"Index {index} out of range for list")
+
+    elif issubclass(cls, (set, tuple)):
+        index = int(key)
+        # tuples index directly, only sets need materializing
+        ordered = list if issubclass(cls, set) else tuple
+
+        def step(curr):
+            try:
+                return ordered(curr)[index]
+            except IndexError:
+                raise KeyError(f"Index {index} out of range for set/tuple")
+
+    else:
+
+        def step(curr):
+            try:
+                return getattr(curr, key)
+            except AttributeError:
+                raise KeyError(f"Attribute {key} not found")
+
+    return step
+
+
+def _dispatcher(key, cache: dict) -> _typing.Callable:
+    def dispatch(curr):
+        step = cache.get(type(curr))
+        if step is None:
+            step = cache[type(curr)] = _step(type(curr), key, False)
+        return step(curr)
+
+    return dispatch
+
+
+def _compile_getter(keys: tuple, caches: list) -> _typing.Callable:
+    """
+    Generate a straight-line getter for ``keys``.
+
+    Plain dicts and lists are indexed inline; any other container goes
+    through the per-type step cache of its position.
+    """
+    namespace = {}
+    lines = ["def get(o):"]
+    for i, key in enumerate(keys):
+        namespace[f"k{i}"] = key
+        namespace[f"m{i}"] = f"Key {key} not found in dictionary"
+        namespace[f"s{i}"] = _dispatcher(key, caches[i])
+        lines += [
+            "    t = type(o)",
+            "    if t is dict:",
+            f"        o = o.get(k{i})",
+            "        if o is None:",
+            f"            raise KeyError(m{i})",
+        ]
+        try:
+            namespace[f"i{i}"] = int(key)
+        except (TypeError, ValueError):
+            pass
+        else:
+            namespace[f"l{i}"] = f"Index {int(key)} out of range for list"
+            lines += [
+                "    elif t is list:",
+                "        try:",
+                f"            o = o[i{i}]",
+                "        except IndexError:",
+                f"            raise KeyError(l{i})",
+            ]
+        lines += ["    else:", f"        o = s{i}(o)"]
+    lines.append("    return o")
+    exec("\n".join(lines), namespace)
+    return namespace["get"]
+
+
+class CompiledPath:
+    """
+    A precompiled accessor for one path of keys.
+
+    Lookups run through generated straight-line code, and each step caches
+    its accessor per container type, so repeated lookups skip the
+    ``isinstance`` chain and key conversion of :func:`get_deep`.
+    Build instances with :func:`compile_path`.
+    """
+
+    __slots__ = ("keys", "_get", "_parent_steps", "_create_steps")
+
+    def __init__(self, keys: _typing.Sequence):
+        if not keys:
+            raise ValueError("compile_path requires at least one key")
+        self.keys = tuple(keys)
+        steps = [{} for _ in self.keys]
+        self._get = _compile_getter(self.keys, steps)
+        self._parent_steps = steps[:-1]
+        self._create_steps = [{} for _ in self.keys[:-1]]
+
+    def __repr__(self):
+        return f"CompiledPath{self.keys!r}"
+
+    def _walk(self, obj, caches, create_missing=False):
+        curr = obj
+        for key, cache in zip(self.keys, caches):
+            step = cache.get(type(curr))
+            if step is None:
+                step = cache[type(curr)] = _step(type(curr), key, create_missing)
+            curr = step(curr)
+        return curr
+
+    def get(self, obj, default=_MISSING):
+        """
+        Get the value at the path, like :func:`get_deep`.
+
+        Args:
+            obj: The nested object.
+            default (Any, optional): Returned instead of raising ``KeyError``
+                when the path is missing.
+        """
+        try:
+            return self._get(obj)
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+
+    __call__ = get
+
+    def get_many(self, objs: _typing.Iterable, default=_MISSING) -> list:
+        """
+        Apply the path to every record of ``objs``.
+
+        Args:
+            objs (Iterable): The records.
+            default (Any, optional): Used for records missing the path instead
+                of raising ``KeyError``.
+
+        Returns:
+            list: One value per record.
+        """
+        get = self._get
+        if default is _MISSING:
+            return [get(obj) for obj in objs]
+
+        values = []
+        for obj in objs:
+            try:
+                values.append(get(obj))
+            except KeyError:
+                values.append(default)
+        return values
+
+    def _parent(self, obj, create_missing):
+        caches = self._create_steps if create_missing else self._parent_steps
+        return self._walk(obj, caches, create_missing)
+
+    def set(self, obj, value):
+        """Set the value at the path, like :func:`set_deep`."""
+        _set_final(self._parent(obj, True), self.keys[-1], value)
+
+    def delete(self, obj):
+        """Delete the value at the path, like :func:`del_deep`."""
+        _del_final(self._parent(obj, False), self.keys[-1])
+
+    def setdefault(self, obj, value, fillpadding=False):
+        """Set the value at the path if missing, like :func:`set_default_deep`."""
+        _set_default_final(self._parent(obj, True), self.keys[-1], value, fillpadding)
+
+
+@_functools.lru_cache(maxsize=1024)
+def _compile_path(keys: tuple) -> CompiledPath:
+    return CompiledPath(keys)
+
+
+def compile_path(*keys) -> CompiledPath:
+    """
+    Compile a path of keys into a reusable accessor.
+
+    Compiled paths are cached, so calling this in a loop is cheap.
+
+    Args:
+        *keys: The sequence of keys, as passed to :func:`get_deep`.
+
+    Returns:
+        CompiledPath: An accessor with ``get``, ``get_many``, ``set``,
+        ``delete`` and ``setdefault`` methods.
+
+    Example:
+        >>> path = compile_path("user", "address", "city")
+        >>> path.get_many(records, default=None)
+        ['Paris', None, 'Oslo']
+    """
+    try:
+        return _compile_path(keys)
+    except TypeError:  # unhashable keys
+        return CompiledPath(keys)
+
+
+# ANCHOR batch access
+def _as_keys(path, sep: str) -> tuple:
+    return tuple(path.split(sep)) if isinstance(path, str) else tuple(path)
+
+
+def _build_trie(paths: _typing.Iterable) -> tuple:
+    """
+    Build a prefix trie of key paths. A node is ``(children, ends)`` where
+    ``ends`` lists the indices of the paths ending at that node.
+    """
+    root = ({}, [])
+    for index, keys in enumerate(paths):
+        node = root
+        for key in keys:
+            node = node[0].setdefault(key, ({}, []))
+        node[1].append(index)
+    return root
+
+
+@_functools.lru_cache(maxsize=256)
+def _path_trie(paths: tuple, sep: str) -> tuple:
+    paths = [_as_keys(path, sep) for path in paths]
+    return len(paths), _build_trie(paths)
+
+
+def get_deep_many(
+    obj: _typing.Union[dict, list, set, tuple],
+    paths: _typing.Iterable,
+    default=None,
+    sep: str = ".",
+) -> list:
+    """
+    Get several values from a nested object, walking shared prefixes once.
+
+    The prefix trie of ``paths`` is cached, so projecting many records with
+    the same paths only builds it once.
+
+    Args:
+        obj (typing.Union[dict, list, set, tuple]): The nested object to retrieve the values from.
+        paths (Iterable): Key sequences, or dotted strings split on ``sep``.
+        default (Any, optional): The value used for missing paths. Defaults to None.
+        sep (str, optional): The separator of dotted paths. Defaults to ".".
+
+    Returns:
+        list: The values, in the order of ``paths``.
+
+    Example:
+        >>> get_deep_many({"a": {"b": 1, "c": 2}}, ["a.b", "a.c", "a.x"])
+        [1, 2, None]
+    """
+    paths = tuple(paths)
+    try:
+        size, trie = _path_trie(paths, sep)
+    except TypeError:  # unhashable paths
+        size, trie = _path_trie.__wrapped__(paths, sep)
+
+    values = [default] * size
+    stack = [(obj, trie)]
+    while stack:
+        curr, (children, ends) = stack.pop()
+        for index in ends:
+            values[index] = curr
+        is_dict = type(curr) is dict
+        for key, child in children.items():
+            if is_dict:
+                value = curr.get(key)
+                if value is not None:
+                    stack.append((value, child))
+                continue
+            try:
+                stack.append((_traverse(curr, (key,)), child))
+            except (KeyError, ValueError, TypeError):
+                # e.g. a non-integer key on a list is a miss, not an error
+                pass
+    return values
+
+
+def set_deep_many(
+    obj: _typing.Union[dict, list, set, tuple], mapping: dict, sep: str = "."
+):
+    """
+    Set several values in a nested object, walking shared prefixes once.
+
+    Missing intermediate keys are created as in :func:`set_deep`.
+
+    Args:
+        obj (typing.Union[dict, list, set, tuple]): The nested object to set the values in.
+        mapping (dict): Maps key tuples, or dotted strings split on ``sep``, to values.
+        sep (str, optional): The separator of dotted paths. Defaults to ".".
+
+    Returns:
+        None
+
+    Example:
+        >>> data = {}
+        >>> set_deep_many(data, {"a.b": 1, ("a", "c"): 2})
+        >>> data
+        {'a': {'b': 1, 'c': 2}}
+    """
+    values = list(mapping.values())
+    paths = [_as_keys(path, sep) for path in mapping]
+    if any(not keys for keys in paths):
+        raise ValueError("Cannot set an empty path")
+
+    stack = [(obj, _build_trie(paths))]
+    while stack:
+        curr, (children, _) = stack.pop()
+        # values are set before descending, so deeper paths land inside them
+        for key, (_, ends) in children.items():
+            for index in ends:
+                _set_final(curr, key, values[index])
+        for key, child in children.items():
+            if child[0]:
+                stack.append((_traverse(curr, (key,), create_missing=True), child))
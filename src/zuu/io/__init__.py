@@ -1,4 +1,33 @@
+import os as _os
+from contextlib import contextmanager as _contextmanager
 from zuu.UTILS.read import read_first_and_last_byte
+from .registry import FormatRegistry, resolve as _resolve
+from .write import open_write, pop_write_options as _pop_write_options
+from .compress import (
+    open_read,
+    compression_of,
+    strip_compression as strip_compression,
+)
+from .cache import LoadCache, DEFAULT_CACHE
+from .bulk import (
+    load_many as load_many,
+    dump_many as dump_many,
+    BulkResult as BulkResult,
+)
+from .sniff import sniff, sniff_delimiter, sniff_format as sniff_format, sniffed
+from .peek import load_path as load_path
+from .zbin import (
+    load_msgpack,
+    iter_msgpack,
+    dump_msgpack,
+    append_msgpack as append_msgpack,
+    loads_msgpack as loads_msgpack,
+    dumps_msgpack as dumps_msgpack,
+    load_zbin,
+    iter_zbin,
+    dump_zbin,
+    append_zbin as append_zbin,
+)
 
 
 #  ANCHOR load
@@ -6,8 +35,13 @@ def load_json(path: str, **kwargs):
     import json
 
     openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    if kwargs.pop("mmap", False):
+        with load_mapped(path) as view:
+            text = str(view, openKwargs["encoding"])
+        return json.loads(text, **loadKwargs, **kwargs)
+    with open_read(path, **openKwargs) as f:
         return json.load(f, **loadKwargs, **kwargs)
 
 
@@ -16,7 +50,7 @@ def load_pickle(path: str, **kwargs):
 
     openKwargs = kwargs.pop("open", {})
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_read(path, "rb", **openKwargs) as f:
         return pickle.load(f, **loadKwargs, **kwargs)
 
 
@@ -24,14 +58,21 @@ def load_csv(path: str, **kwargs):
     import csv
 
     openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    openKwargs.setdefault("newline", "")
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
-        return csv.load(f, **loadKwargs, **kwargs)
+    with open_read(path, **openKwargs) as f:
+        return list(csv.reader(f, **loadKwargs, **kwargs))
 
 
 def load_txt(path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
-    with open(path, **openKwargs) as f:
+    openKwargs.setdefault("encoding", "utf-8")
+    if kwargs.pop("mmap", False):
+        # decodes straight from the mapping, without newline translation
+        with load_mapped(path) as view:
+            return str(view, openKwargs["encoding"])
+    with open_read(path, **openKwargs) as f:
         return f.read()
 
 
@@ -39,38 +80,50 @@ def load_xml(path: str, **kwargs):
     import xml.etree.ElementTree as ET
 
     openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_read(path, **openKwargs) as f:
         return ET.parse(f, **loadKwargs, **kwargs)
 
 
 def load_toml(path: str, **kwargs):
     import toml
 
-    return toml.load(path, **kwargs)
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    with open_read(path, **openKwargs) as f:
+        return toml.load(f, **kwargs)
 
 
 def load_yaml(path: str, **kwargs):
     import yaml
 
     openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_read(path, **openKwargs) as f:
         return yaml.safe_load(f, **loadKwargs, **kwargs)
 
 
-DEFAULT_LOAD = [
-    [lambda path: path.endswith(".json"), load_json],
-    [lambda path: path.endswith(".pickle"), load_pickle],
-    [lambda path: path.endswith(".csv"), load_csv],
-    [lambda path: path.endswith(".txt"), load_txt],
-    [lambda path: path.endswith(".toml"), load_toml],
-    [lambda path: path.endswith(".xml"), load_xml],
-    [
-        lambda path: read_first_and_last_byte(path) in [(b"[", b"]"), (b"{", b"}")],
-        load_json,
-    ],
-]
+def _sniff_json(path: str, *args) -> bool:
+    try:
+        return read_first_and_last_byte(path) in [(b"[", b"]"), (b"{", b"}")]
+    except OSError:
+        return False
+
+
+DEFAULT_LOAD = FormatRegistry()
+DEFAULT_LOAD.register(".json", load_json)
+DEFAULT_LOAD.register(".pickle", load_pickle)
+DEFAULT_LOAD.register(".csv", load_csv)
+DEFAULT_LOAD.register(".txt", load_txt)
+DEFAULT_LOAD.register(".toml", load_toml)
+DEFAULT_LOAD.register(".xml", load_xml)
+DEFAULT_LOAD.register(".yaml", load_yaml)
+DEFAULT_LOAD.register(".yml", load_yaml)
+DEFAULT_LOAD.register(".msgpack", load_msgpack)
+DEFAULT_LOAD.register(".zbin", load_zbin)
+DEFAULT_LOAD.register_sniffer(_sniff_json, load_json)
 
 
 def load(
@@ -78,22 +131,44 @@ def load(
     _seq: list = DEFAULT_LOAD,
     _throw_error: bool = True,
     _try_all: bool = False,
+    cache: bool | LoadCache = False,
     **kwargs,
 ):
-    for validator, loader in _seq:
-        if validator(path):
-            try:
-                return loader(path, **kwargs)
-            except Exception as e:
-                if _try_all:
-                    continue
-                elif _throw_error:
-                    raise e
-                else:
-                    return None
+    path = _os.fspath(path)
+    if cache:
+        if cache is True:
+            cache = DEFAULT_CACHE
+        return cache.get(
+            path,
+            lambda: load(path, _seq, _throw_error, _try_all, **kwargs),
+            id(_seq),
+            _throw_error,
+            _try_all,
+            repr(sorted(kwargs.items())),
+        )
+    for loader in _resolve(path, _seq):
+        try:
+            return loader(path, **kwargs)
+        except Exception as e:
+            if _try_all:
+                continue
+            elif _throw_error:
+                raise e
+            else:
+                return None
     raise ValueError(f"No suitable loader found for file: {path}")
 
 
+def cached_load(path: str, cache: LoadCache = DEFAULT_CACHE, **kwargs):
+    """
+    Load a file through a stat-invalidated LRU cache.
+
+    Repeated loads of an unchanged file skip opening and parsing it.
+    Hit/miss counters are available through ``cache.info()``.
+    """
+    return load(path, cache=cache, **kwargs)
+
+
 # ANCHOR advanced load
 
 
@@ -103,12 +178,139 @@ def load_json_w_encoding(path: str, **kwargs):
     openKwargs: dict = kwargs.pop("open", {})
     openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
     loadKwargs: dict = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    if kwargs.pop("mmap", False):
+        with load_mapped(path) as view:
+            text = str(view, openKwargs["encoding"])
+        return json.loads(text, **loadKwargs, **kwargs)
+    with open_read(path, **openKwargs) as f:
         return json.load(f, **loadKwargs, **kwargs)
 
 
+@_contextmanager
+def load_mapped(path: str):
+    """
+    Memory-map a file and yield a read-only memoryview over its contents.
+
+    The view shares the page cache instead of copying the file into a bytes
+    object. It, and any slice of it, must not be used after the block exits.
+    Compressed files are decompressed into memory instead.
+
+    Example:
+        >>> with load_mapped("data.bin") as view:
+        ...     header = bytes(view[:4])
+    """
+    import mmap
+
+    if compression_of(path):
+        # compressed files cannot be mapped, decompress into memory instead
+        with open_read(path, "rb") as f:
+            yield memoryview(f.read())
+        return
+
+    with open(path, "rb") as f:
+        if _os.fstat(f.fileno()).st_size == 0:
+            # empty files cannot be mapped
+            yield memoryview(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                yield view
+
+
+# json is read as UTF-8 by default, whatever the locale
+DEFAULT_LOAD.replace(".json", load_json_w_encoding)
 UTF8_LOAD = DEFAULT_LOAD.copy()
-UTF8_LOAD[0][1] = load_json_w_encoding
+
+
+# ANCHOR iter load
+def _batched(iterable, batch_size: int | None):
+    if not batch_size:
+        return iterable
+    from itertools import batched
+
+    return (list(batch) for batch in batched(iterable, batch_size))
+
+
+def iter_jsonl(path: str, **kwargs):
+    """
+    Lazily yield one parsed record per non-blank line of a JSON Lines file.
+    """
+    import json
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    loadKwargs = kwargs.pop("load", {})
+    with open_read(path, **openKwargs) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line, **loadKwargs, **kwargs)
+
+
+def iter_csv(path: str, dict_rows: bool = False, **kwargs):
+    """
+    Lazily yield the rows of a CSV file.
+
+    Args:
+        path (str): The path to the CSV file.
+        dict_rows (bool, optional): Yield dicts keyed by the header row
+            (``csv.DictReader``) instead of lists. Defaults to False.
+    """
+    import csv
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    openKwargs.setdefault("newline", "")
+    readKwargs = kwargs.pop("read", {})
+    reader = csv.DictReader if dict_rows else csv.reader
+    with open_read(path, **openKwargs) as f:
+        yield from reader(f, **readKwargs, **kwargs)
+
+
+def iter_txt(path: str, keepends: bool = False, **kwargs):
+    """
+    Lazily yield the lines of a text file.
+    """
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    with open_read(path, **openKwargs) as f:
+        if keepends:
+            yield from f
+        else:
+            for line in f:
+                yield line.rstrip("\r\n")
+
+
+DEFAULT_ITER_LOAD = FormatRegistry()
+DEFAULT_ITER_LOAD.register(".jsonl", iter_jsonl)
+DEFAULT_ITER_LOAD.register(".ndjson", iter_jsonl)
+DEFAULT_ITER_LOAD.register(".csv", iter_csv)
+DEFAULT_ITER_LOAD.register(".txt", iter_txt)
+DEFAULT_ITER_LOAD.register(".msgpack", iter_msgpack)
+DEFAULT_ITER_LOAD.register(".zbin", iter_zbin)
+
+
+def iter_load(
+    path: str,
+    batch_size: int | None = None,
+    _seq: list = DEFAULT_ITER_LOAD,
+    **kwargs,
+):
+    """
+    Lazily iterate the records of a file in constant memory.
+
+    Args:
+        path (str): The path to the file.
+        batch_size (int, optional): Yield lists of up to ``batch_size`` records
+            instead of single records. Defaults to None.
+        _seq (list, optional): The dispatch table. Defaults to DEFAULT_ITER_LOAD.
+
+    Returns:
+        Iterator: The records (or batches of records) of the file.
+    """
+    path = _os.fspath(path)
+    for loader in _resolve(path, _seq):
+        return _batched(loader(path, **kwargs), batch_size)
+    raise ValueError(f"No suitable iterator found for file: {path}")
 
 
 # ANCHOR dump
@@ -117,7 +319,7 @@ def dump_json(obj, path: str, **kwargs):
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "w", **openKwargs) as f:
+    with open_write(path, "w", **_pop_write_options(kwargs), **openKwargs) as f:
         json.dump(obj, f, **dumpKwargs, **kwargs)
 
 
@@ -126,7 +328,7 @@ def dump_pickle(obj, path: str, **kwargs):
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "wb", **openKwargs) as f:
+    with open_write(path, "wb", **_pop_write_options(kwargs), **openKwargs) as f:
         pickle.dump(obj, f, **dumpKwargs, **kwargs)
 
 
@@ -135,14 +337,16 @@ def dump_csv(obj, path: str, **kwargs):
 
     openKwargs: dict = kwargs.pop("open", {})
     writeKwargs: dict = kwargs.pop("write", {})
-    with open(path, "w", newline="", **openKwargs) as f:
+    with open_write(
+        path, "w", newline="", **_pop_write_options(kwargs), **openKwargs
+    ) as f:
         writer = csv.writer(f, **writeKwargs)
         writer.writerows(obj)
 
 
 def dump_txt(obj, path: str, **kwargs):
     openKwargs: dict = kwargs.pop("open", {})
-    with open(path, "w", **openKwargs) as f:
+    with open_write(path, "w", **_pop_write_options(kwargs), **openKwargs) as f:
         f.write(str(obj))
 
 
@@ -151,7 +355,7 @@ def dump_toml(obj, path: str, **kwargs):
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "w", **openKwargs) as f:
+    with open_write(path, "w", **_pop_write_options(kwargs), **openKwargs) as f:
         toml.dump(obj, f, **dumpKwargs, **kwargs)
 
 
@@ -160,7 +364,7 @@ def dump_xml(obj, path: str, **kwargs):
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "w", **openKwargs) as f:
+    with open_write(path, "w", **_pop_write_options(kwargs), **openKwargs) as f:
         ET.dump(obj, f, **dumpKwargs, **kwargs)
 
 
@@ -172,26 +376,26 @@ def dump_json_w_encoding(obj, path: str, **kwargs):
     openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
     dumpKwargs: dict = kwargs.pop("dump", {})
     dumpKwargs["ensure_ascii"] = kwargs.pop("ensure_ascii", False)
-    with open(path, "w", **openKwargs) as f:
+    with open_write(path, "w", **_pop_write_options(kwargs), **openKwargs) as f:
         json.dump(obj, f, **dumpKwargs, **kwargs)
 
 
-DEFAULT_DUMP = [
-    [
-        lambda path, obj: path.endswith(".json") and isinstance(obj, (dict, list)),
-        dump_json,
-    ],
-    [lambda path, obj: path.endswith(".pickle"), dump_pickle],
-    [lambda path, obj: path.endswith(".xml"), dump_xml],
-    [lambda path, obj: path.endswith(".csv") and isinstance(obj, list), dump_csv],
-    [lambda path, obj: path.endswith(".txt") and isinstance(obj, str), dump_txt],
-    [lambda path, obj: path.endswith(".toml") and isinstance(obj, dict), dump_toml],
-    [
-        lambda path, obj: read_first_and_last_byte(path) in [(b"[", b"]"), (b"{", b"}")]
-        and isinstance(obj, (dict, list)),
-        dump_json,
-    ],
-]
+def _is_json_obj(path: str, obj) -> bool:
+    return isinstance(obj, (dict, list))
+
+
+DEFAULT_DUMP = FormatRegistry()
+DEFAULT_DUMP.register(".json", dump_json, check=_is_json_obj)
+DEFAULT_DUMP.register(".pickle", dump_pickle)
+DEFAULT_DUMP.register(".xml", dump_xml)
+DEFAULT_DUMP.register(".csv", dump_csv, check=lambda path, obj: isinstance(obj, list))
+DEFAULT_DUMP.register(".txt", dump_txt, check=lambda path, obj: isinstance(obj, str))
+DEFAULT_DUMP.register(".toml", dump_toml, check=lambda path, obj: isinstance(obj, dict))
+DEFAULT_DUMP.register(".msgpack", dump_msgpack)
+DEFAULT_DUMP.register(".zbin", dump_zbin)
+DEFAULT_DUMP.register_sniffer(
+    lambda path, obj: _is_json_obj(path, obj) and _sniff_json(path), dump_json
+)
 
 
 def dump(
@@ -202,27 +406,34 @@ def dump(
     _try_all: bool = False,
     **kwargs,
 ):
-    for validator, dumper in _seq:
-        if validator(path, obj):
-            try:
-                return dumper(obj, path, **kwargs)
-            except Exception as e:
-                if not _try_all and _throw_error:
-                    raise e
+    path = _os.fspath(path)
+    for dumper in _resolve(path, _seq, obj):
+        try:
+            return dumper(obj, path, **kwargs)
+        except Exception as e:
+            if not _try_all and _throw_error:
+                raise e
     if _throw_error:
         raise ValueError(f"No suitable dumper found for {path}")
 
 
+# json is written as UTF-8 by default, without escaping non-ASCII characters
+DEFAULT_DUMP.replace(".json", dump_json_w_encoding)
 UTF8_DUMP = DEFAULT_DUMP.copy()
-UTF8_DUMP[0][1] = dump_json_w_encoding
 
 
 # ANCHOR loads
 
 
+def _as_text(s) -> str:
+    return s if isinstance(s, str) else bytes(s).decode("utf-8-sig")
+
+
 def loads_json(s: str, **kwargs):
     import json
 
+    if isinstance(s, memoryview):
+        s = s.tobytes()
     return json.loads(s, **kwargs)
 
 
@@ -234,42 +445,62 @@ def loads_pickle(s: str, **kwargs):
 
 def loads_csv(s: str, **kwargs):
     import csv
+    from io import StringIO
 
-    return csv.loads(s, **kwargs)
+    s = _as_text(s)
+    if "delimiter" not in kwargs and "dialect" not in kwargs:
+        # the delimiter the sniffer recognised the payload by
+        kwargs["delimiter"] = sniff_delimiter(s) or ","
+    return list(csv.reader(StringIO(s, newline=""), **kwargs))
 
 
 def loads_toml(s: str, **kwargs):
     import toml
 
-    return toml.loads(s, **kwargs)
+    return toml.loads(_as_text(s), **kwargs)
 
 
 def loads_yaml(s: str, **kwargs):
     import yaml
     from io import StringIO
 
-    return yaml.load(StringIO(s), **kwargs)
+    return yaml.safe_load(StringIO(_as_text(s)), **kwargs)
 
 
 def loads_xml(s: str, **kwargs):
     import xml.etree.ElementTree as ET
 
+    if isinstance(s, (bytearray, memoryview)):
+        s = bytes(s)
     return ET.fromstring(s, **kwargs)
 
 
 DEFAULT_LOADS = [
-    [lambda s: s.startswith("{") and s.endswith("}"), loads_json],
-    [lambda s: s.startswith("[") and s.endswith("]"), loads_json],
-    [lambda s: s.startswith("<") and s.endswith(">"), loads_xml],
-    [lambda s: s.startswith(b"\x80") or s.startswith(b"\x00"), loads_pickle],
-    [
-        lambda s: ((s.startswith("[") and "\n" in s) or "[[" in s) and "=" in s,
-        loads_toml,
-    ],
-    [lambda s: "\t" in s and ";" in s, loads_yaml],
-    [lambda s: "," in s and "\n" in s, loads_csv],
+    [sniffed("json"), loads_json],
+    [sniffed("xml"), loads_xml],
+    [sniffed("toml"), loads_toml],
+    [sniffed("yaml"), loads_yaml],
+    [sniffed("csv"), loads_csv],
 ]
 
+# unpickling runs arbitrary code, so only trusted payloads may opt in with
+# loads(s, _seq=PICKLE_LOADS)
+PICKLE_LOADS = DEFAULT_LOADS + [[sniffed("pickle"), loads_pickle]]
+
+
+def _resolve_loads(s, _seq):
+    if all(isinstance(validator, sniffed) for validator, _ in _seq):
+        # one sniff, then loaders in confidence order
+        loaders = {}
+        for validator, loader in _seq:
+            loaders.setdefault(validator.format, []).append(loader)
+        for fmt, _ in sniff(s):
+            yield from loaders.get(fmt, ())
+        return
+    for validator, loader in _seq:
+        if validator(s):
+            yield loader
+
 
 def loads(
     s: str,
@@ -278,17 +509,16 @@ def loads(
     _try_all: bool = False,
     **kwargs,
 ):
-    for validator, loader in _seq:
-        if validator(s):
-            try:
-                return loader(s, **kwargs)
-            except Exception as e:
-                if _try_all:
-                    continue
-                elif _throw_error:
-                    raise e
-                else:
-                    return None
+    for loader in _resolve_loads(s, _seq):
+        try:
+            return loader(s, **kwargs)
+        except Exception as e:
+            if _try_all:
+                continue
+            elif _throw_error:
+                raise e
+            else:
+                return None
     raise ValueError(f"No suitable loader found for string: {s}")
 
 
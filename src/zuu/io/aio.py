@@ -0,0 +1,119 @@
+import asyncio as _asyncio
+import functools as _functools
+import os as _os
+import typing as _typing
+
+from zuu import io as _io
+
+# payloads up to this many bytes are parsed on the event loop itself
+INLINE_THRESHOLD = 64 * 1024
+
+
+async def _run(call, inline: bool, executor):
+    if inline:
+        return call()
+    return await _asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+# suffixes whose default loader parses the same as the DEFAULT_LOADS entry
+_INLINE_FORMATS = {".json": "json", ".toml": "toml", ".yaml": "yaml", ".yml": "yaml"}
+
+
+def _read_or_load(path: str, inline_threshold: int, call):
+    # one executor hop: small payloads come back as bytes, large ones parsed
+    try:
+        with open(path, "rb") as f:
+            if _os.fstat(f.fileno()).st_size <= inline_threshold:
+                return f.read(), None
+    except OSError:
+        # let the loader raise (or swallow) the proper error
+        pass
+    return None, call()
+
+
+async def load(
+    path: str,
+    _seq: list = _io.DEFAULT_LOAD,
+    _throw_error: bool = True,
+    _try_all: bool = False,
+    inline_threshold: int = INLINE_THRESHOLD,
+    executor: _typing.Optional[_typing.Any] = None,
+    **kwargs,
+):
+    """
+    Load a file without blocking the event loop on large payloads.
+
+    Args:
+        inline_threshold (int, optional): Uncompressed json, toml and yaml files up to this
+            size are read in the executor but parsed on the loop.
+        executor (Executor, optional): Executor for offloaded work. Defaults to the loop default.
+        Other arguments are the same as :func:`zuu.io.load`.
+    """
+    path = _os.fspath(path)
+    call = _functools.partial(_io.load, path, _seq, _throw_error, _try_all, **kwargs)
+    # compressed suffixes are not listed: their on-disk size says nothing
+    # about the parse cost
+    fmt = _INLINE_FORMATS.get(_os.path.splitext(path)[1])
+    if fmt is None or kwargs or _seq is not _io.DEFAULT_LOAD:
+        return await _run(call, False, executor)
+
+    read = _functools.partial(_read_or_load, path, inline_threshold, call)
+    data, result = await _run(read, False, executor)
+    if data is None:
+        return result
+    loader = next(h for v, h in _io.DEFAULT_LOADS if v.format == fmt)
+    try:
+        return loader(data)
+    except Exception:
+        # let the regular loader chain decide how to fail, off the loop
+        return await _run(call, False, executor)
+
+
+async def dump(
+    obj,
+    path: str,
+    _seq: list = _io.DEFAULT_DUMP,
+    _throw_error: bool = True,
+    _try_all: bool = False,
+    executor: _typing.Optional[_typing.Any] = None,
+    **kwargs,
+):
+    """
+    Dump an object in an executor. Same arguments as :func:`zuu.io.dump`.
+    """
+    call = _functools.partial(
+        _io.dump, obj, _os.fspath(path), _seq, _throw_error, _try_all, **kwargs
+    )
+    return await _run(call, False, executor)
+
+
+async def loads(
+    s: _typing.Union[str, bytes],
+    _seq: list = _io.DEFAULT_LOADS,
+    _throw_error: bool = True,
+    _try_all: bool = False,
+    inline_threshold: int = INLINE_THRESHOLD,
+    executor: _typing.Optional[_typing.Any] = None,
+    **kwargs,
+):
+    """
+    Parse a string, offloading payloads larger than ``inline_threshold``.
+    Same arguments as :func:`zuu.io.loads`.
+    """
+    call = _functools.partial(_io.loads, s, _seq, _throw_error, _try_all, **kwargs)
+    return await _run(call, len(s) <= inline_threshold, executor)
+
+
+async def dumps(
+    obj,
+    format: str = "json",
+    executor: _typing.Optional[_typing.Any] = None,
+    **kwargs,
+):
+    """
+    Serialize an object in an executor using ``zuu.io.dumps_<format>``.
+    """
+    func = getattr(_io, f"dumps_{format}", None)
+    if func is None:
+        raise ValueError(f"No dumps function for format: {format}")
+    return await _run(_functools.partial(func, obj, **kwargs), False, executor)
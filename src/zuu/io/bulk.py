@@ -0,0 +1,104 @@
+import typing as _typing
+from concurrent.futures import (
+    ProcessPoolExecutor as _ProcessPoolExecutor,
+    ThreadPoolExecutor as _ThreadPoolExecutor,
+    as_completed as _as_completed,
+)
+
+_EXECUTORS = {"thread": _ThreadPoolExecutor, "process": _ProcessPoolExecutor}
+
+
+class BulkResult(_typing.NamedTuple):
+    """The outcome of one file in a bulk operation."""
+
+    path: str
+    value: _typing.Any = None
+    error: _typing.Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _load_one(path: str, kwargs: dict) -> BulkResult:
+    from zuu.io import load
+
+    try:
+        return BulkResult(path, load(path, **kwargs))
+    except Exception as e:
+        return BulkResult(path, error=e)
+
+
+def _dump_one(path: str, obj, kwargs: dict) -> BulkResult:
+    from zuu.io import dump
+
+    try:
+        dump(obj, path, **kwargs)
+        return BulkResult(path)
+    except Exception as e:
+        return BulkResult(path, error=e)
+
+
+def _run(func, jobs, workers, mode, ordered) -> _typing.Iterator[BulkResult]:
+    if mode not in _EXECUTORS:
+        raise ValueError(f"mode must be one of {tuple(_EXECUTORS)}")
+    executor = _EXECUTORS[mode](max_workers=workers)
+    futures = [executor.submit(func, *job) for job in jobs]
+    # queued work keeps running; the workers exit once it is drained
+    executor.shutdown(wait=False)
+    return (f.result() for f in (futures if ordered else _as_completed(futures)))
+
+
+def load_many(
+    paths: _typing.Iterable[str],
+    workers: _typing.Optional[int] = None,
+    mode: str = "thread",
+    ordered: bool = True,
+    **kwargs,
+) -> _typing.Iterator[BulkResult]:
+    """
+    Load many files concurrently.
+
+    Work starts immediately; the returned iterator yields one
+    :class:`BulkResult` per path and never raises for a failing file.
+
+    Args:
+        paths (Iterable[str]): The files to load.
+        workers (int, optional): Pool size. Defaults to the executor default.
+        mode (str, optional): ``"thread"`` for I/O-bound formats, ``"process"``
+            for parse-heavy ones such as YAML or TOML. Process mode only works
+            with picklable kwargs. Defaults to "thread".
+        ordered (bool, optional): Yield in input order instead of completion order. Defaults to True.
+        **kwargs: Passed to :func:`zuu.io.load`.
+
+    Example:
+        >>> for res in load_many(glob.glob("conf/*.json")):
+        ...     if not res.ok:
+        ...         print(res.path, res.error)
+    """
+    jobs = [(path, kwargs) for path in paths]
+    return _run(_load_one, jobs, workers, mode, ordered)
+
+
+def dump_many(
+    items: _typing.Union[_typing.Mapping[str, _typing.Any], _typing.Iterable[tuple]],
+    workers: _typing.Optional[int] = None,
+    mode: str = "thread",
+    ordered: bool = True,
+    **kwargs,
+) -> _typing.Iterator[BulkResult]:
+    """
+    Dump many objects concurrently.
+
+    Args:
+        items (Mapping | Iterable[tuple]): A ``{path: obj}`` mapping or ``(obj, path)`` pairs.
+        workers (int, optional): Pool size. Defaults to the executor default.
+        mode (str, optional): ``"thread"`` or ``"process"``. Defaults to "thread".
+        ordered (bool, optional): Yield in input order instead of completion order. Defaults to True.
+        **kwargs: Passed to :func:`zuu.io.dump`.
+    """
+    if isinstance(items, _typing.Mapping):
+        jobs = [(path, obj, kwargs) for path, obj in items.items()]
+    else:
+        jobs = [(path, obj, kwargs) for obj, path in items]
+    return _run(_dump_one, jobs, workers, mode, ordered)
@@ -0,0 +1,153 @@
+import copy as _copy
+import os as _os
+import threading as _threading
+import types as _types
+import typing as _typing
+from collections import OrderedDict as _OrderedDict
+
+MODES = ("copy", "shared", "frozen")
+
+
+def freeze(obj):
+    """
+    Recursively convert dicts, lists and sets into read-only counterparts.
+
+    Dicts become ``MappingProxyType``, lists become tuples and sets become
+    frozensets; other values are returned as is.
+    """
+    if isinstance(obj, dict):
+        return _types.MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    if isinstance(obj, set):
+        return frozenset(obj)
+    return obj
+
+
+def fast_copy(obj):
+    """
+    Deep copy of JSON-like data, falling back to ``copy.deepcopy`` for other types.
+    """
+    if isinstance(obj, dict):
+        return {k: fast_copy(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [fast_copy(v) for v in obj]
+    if obj is None or isinstance(obj, (str, int, float, bool, bytes)):
+        return obj
+    return _copy.deepcopy(obj)
+
+
+class LoadCache:
+    """
+    A thread-safe LRU of parsed files, invalidated by file stat.
+
+    Entries are validated against ``(st_mtime_ns, st_size, st_ino)`` on every
+    lookup, so an unchanged file costs one ``os.stat`` and a dict lookup.
+    The memory cap is approximated by the on-disk size of the cached files.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        maxbytes: _typing.Optional[int] = 64 << 20,
+        mode: str = "copy",
+    ):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 256.
+            maxbytes (int, optional): Maximum total file size of the entries,
+                None for no limit. Defaults to 64 MiB.
+            mode (str, optional): What lookups return: ``"copy"`` a deep copy,
+                ``"shared"`` the cached object itself, ``"frozen"`` a shared
+                read-only view built once per load. Defaults to "copy".
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: _OrderedDict = _OrderedDict()
+        self._bytes = 0
+        self._lock = _threading.Lock()
+
+    def _out(self, value):
+        return fast_copy(value) if self.mode == "copy" else value
+
+    def get(self, path: str, loader: _typing.Callable, *key):
+        """
+        Return the cached result for ``path``, calling ``loader()`` on a miss.
+
+        Args:
+            path (str): The file path.
+            loader (Callable): Zero-argument callable producing the parsed value.
+            *key: Extra hashable values distinguishing loads of the same path.
+        """
+        try:
+            st = _os.stat(path)
+        except OSError:
+            # nothing to cache, the loader raises or returns None as it would uncached
+            return loader()
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        entryKey = (_os.path.abspath(path), *key)
+
+        with self._lock:
+            entry = self._entries.get(entryKey)
+            if entry is not None and entry[0] == sig:
+                self._entries.move_to_end(entryKey)
+                self.hits += 1
+                return self._out(entry[1])
+            self.misses += 1
+
+        value = loader()
+        if value is None:
+            return None
+        if self.mode == "frozen":
+            value = freeze(value)
+
+        with self._lock:
+            old = self._entries.pop(entryKey, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[entryKey] = (sig, value, st.st_size)
+            self._bytes += st.st_size
+            self._evict()
+        return self._out(value)
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.maxsize
+            or (self.maxbytes is not None and self._bytes > self.maxbytes)
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, path: str):
+        """Drop every entry of ``path``."""
+        path = _os.path.abspath(path)
+        with self._lock:
+            for entryKey in [k for k in self._entries if k[0] == path]:
+                self._bytes -= self._entries.pop(entryKey)[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> dict:
+        """Return the hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+DEFAULT_CACHE = LoadCache()
@@ -0,0 +1,112 @@
+import io as _io
+import os as _os
+import typing as _typing
+
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "lzma",
+    ".lzma": "lzma",
+    ".zst": "zstd",
+}
+
+_TEXT_KWARGS = ("encoding", "errors", "newline")
+
+
+def compression_of(path: str) -> _typing.Optional[str]:
+    """Return the compression codec implied by the path suffix, or None."""
+    return COMPRESSION_SUFFIXES.get(_os.path.splitext(path)[1])
+
+
+def strip_compression(path: str) -> str:
+    """Strip a compression suffix, so ``data.json.gz`` becomes ``data.json``."""
+    root, suffix = _os.path.splitext(path)
+    return root if suffix in COMPRESSION_SUFFIXES else path
+
+
+def _zstd():
+    try:
+        from compression import zstd  # python 3.14+
+
+        return zstd
+    except ImportError:
+        import zstandard
+
+        return zstandard
+
+
+def _text_kwargs(openKwargs: dict) -> dict:
+    return {k: openKwargs[k] for k in _TEXT_KWARGS if k in openKwargs}
+
+
+def open_read(path: str, mode: str = "r", **openKwargs):
+    """
+    Open a file for reading, transparently decompressing it by suffix.
+
+    Decompression is streamed, so the compressed file is never held in
+    memory alongside its decompressed payload.
+    """
+    codec = compression_of(path)
+    if codec is None:
+        return open(path, mode, **openKwargs)
+
+    mode = mode if "b" in mode or "t" in mode else mode + "t"
+    textKwargs = _text_kwargs(openKwargs) if "t" in mode else {}
+    if codec == "gzip":
+        import gzip
+
+        return gzip.open(path, mode, **textKwargs)
+    if codec == "bz2":
+        import bz2
+
+        return bz2.open(path, mode, **textKwargs)
+    if codec == "lzma":
+        import lzma
+
+        return lzma.open(path, mode, **textKwargs)
+    return _zstd().open(path, mode, **textKwargs)
+
+
+def wrap_compressed(
+    raw: _typing.BinaryIO,
+    codec: str,
+    mode: str = "w",
+    compresslevel: _typing.Optional[int] = None,
+    **openKwargs,
+):
+    """
+    Wrap a binary file opened for writing in a streaming compressor.
+
+    Output is deterministic (no timestamp or file name in gzip headers), so
+    ``skip_unchanged`` writes can compare it. Closing the returned file
+    finishes the stream but leaves ``raw`` open.
+    """
+    if codec == "gzip":
+        import gzip
+
+        level = 9 if compresslevel is None else compresslevel
+        f = gzip.GzipFile(
+            filename="", mode="wb", fileobj=raw, compresslevel=level, mtime=0
+        )
+    elif codec == "bz2":
+        import bz2
+
+        f = bz2.BZ2File(
+            raw, "wb", compresslevel=9 if compresslevel is None else compresslevel
+        )
+    elif codec == "lzma":
+        import lzma
+
+        f = lzma.LZMAFile(raw, "wb", preset=compresslevel)
+    else:
+        zstd = _zstd()
+        if hasattr(zstd, "ZstdFile"):
+            f = zstd.ZstdFile(raw, "wb", level=compresslevel)
+        else:
+            f = zstd.ZstdCompressor(
+                level=3 if compresslevel is None else compresslevel
+            ).stream_writer(raw, closefd=False)
+
+    if "b" in mode:
+        return f
+    return _io.TextIOWrapper(f, **_text_kwargs(openKwargs))
@@ -1,53 +1,118 @@
 import orjson
 from ..io import *  # noqa
+from .write import pop_write_options as _pop_write_options
+
+# zuu/stdlib-style keyword -> orjson option flag
+OPTION_FLAGS = {
+    "indent": orjson.OPT_INDENT_2,
+    "sort_keys": orjson.OPT_SORT_KEYS,
+    "numpy": orjson.OPT_SERIALIZE_NUMPY,
+    "non_str_keys": orjson.OPT_NON_STR_KEYS,
+    "append_newline": orjson.OPT_APPEND_NEWLINE,
+    "naive_utc": orjson.OPT_NAIVE_UTC,
+    "utc_z": orjson.OPT_UTC_Z,
+    "omit_microseconds": orjson.OPT_OMIT_MICROSECONDS,
+    "strict_integer": orjson.OPT_STRICT_INTEGER,
+}
+
+
+def _dumps(obj, kwargs: dict) -> bytes:
+    """
+    Serialize with orjson, translating keyword flags into its ``option`` bitmask.
+
+    ``indent`` only enables orjson's fixed 2-space indentation, and
+    ``ensure_ascii`` is ignored since orjson always emits UTF-8.
+    """
+    option = kwargs.pop("option", 0)
+    for name, flag in OPTION_FLAGS.items():
+        if kwargs.pop(name, None):
+            option |= flag
+    kwargs.pop("ensure_ascii", None)
+    return orjson.dumps(obj, option=option or None, **kwargs)
 
 
 def load_json(path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
     loadKwargs = kwargs.pop("load", {})
-    with open(path, "rb", **openKwargs) as f:
+    if kwargs.pop("mmap", False):
+        with load_mapped(path) as view:
+            return orjson.loads(view, **loadKwargs, **kwargs)
+    with open_read(path, "rb", **openKwargs) as f:
         return orjson.loads(f.read(), **loadKwargs, **kwargs)
 
 
 def dump_json(obj, path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
     dumpKwargs = kwargs.pop("dump", {})
-    with open(path, "wb", **openKwargs) as f:
-        return orjson.dumps(obj, f, **dumpKwargs, **kwargs)
+    writeOptions = _pop_write_options(kwargs)
+    data = _dumps(obj, {**dumpKwargs, **kwargs})
+    with open_write(path, "wb", **writeOptions, **openKwargs) as f:
+        f.write(data)
 
 
 def loads_json(s: str, **kwargs):
-    return orjson.loads(s, **kwargs)
+    if kwargs:
+        # orjson takes no options, e.g. object_hook or parse_float
+        import json
+
+        if isinstance(s, memoryview):
+            s = s.tobytes()
+        return json.loads(s, **kwargs)
+    return orjson.loads(s)
 
 
 def dumps_json(obj, **kwargs):
-    return orjson.dumps(obj, **kwargs)
+    return _dumps(obj, kwargs)
+
+
+def iter_jsonl(path: str, **kwargs):
+    openKwargs = kwargs.pop("open", {})
+    loadKwargs = kwargs.pop("load", {})
+    with open_read(path, "rb", **openKwargs) as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line, **loadKwargs, **kwargs)
+
+
+def _is_utf8(encoding: str) -> bool:
+    return encoding.lower().replace("-", "").replace("_", "") == "utf8"
 
 
 def load_json_w_encoding(path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
-    openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
+    encoding = kwargs.pop("encoding", "utf-8")
     loadKwargs = kwargs.pop("load", {})
-    with open(path, "rb", **openKwargs) as f:
+    mapped = kwargs.pop("mmap", False)
+    if not _is_utf8(encoding):
+        openKwargs["encoding"] = encoding
+        with open_read(path, **openKwargs) as f:
+            return orjson.loads(f.read(), **loadKwargs, **kwargs)
+    if mapped:
+        with load_mapped(path) as view:
+            return orjson.loads(view, **loadKwargs, **kwargs)
+    with open_read(path, "rb", **openKwargs) as f:
         return orjson.loads(f.read(), **loadKwargs, **kwargs)
 
 
 def dump_json_w_encoding(obj, path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
-    openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
+    encoding = kwargs.pop("encoding", "utf-8")
     dumpKwargs = kwargs.pop("dump", {})
-    with open(path, "wb", **openKwargs) as f:
-        return orjson.dumps(obj, **dumpKwargs, **kwargs)
+    writeOptions = _pop_write_options(kwargs)
+    data = _dumps(obj, {**dumpKwargs, **kwargs})
+    if not _is_utf8(encoding):
+        data = data.decode("utf-8").encode(encoding)
+    with open_write(path, "wb", **writeOptions, **openKwargs) as f:
+        f.write(data)
 
 
 # Override the default loaders/dumpers
-DEFAULT_LOAD[0][1] = load_json
-DEFAULT_LOAD[-1][1] = load_json
-DEFAULT_DUMP[0][1] = dump_json
-DEFAULT_DUMP[-1][1] = dump_json
+DEFAULT_LOAD.replace(".json", load_json)
+DEFAULT_DUMP.replace(".json", dump_json)
+DEFAULT_ITER_LOAD.replace(".jsonl", iter_jsonl)
+DEFAULT_ITER_LOAD.replace(".ndjson", iter_jsonl)
 DEFAULT_LOADS[0][1] = loads_json
-DEFAULT_LOADS[1][1] = loads_json
 
 # Override UTF8 variants
-UTF8_LOAD[0][1] = load_json_w_encoding
-UTF8_DUMP[0][1] = dump_json_w_encoding
+UTF8_LOAD.replace(".json", load_json_w_encoding)
+UTF8_DUMP.replace(".json", dump_json_w_encoding)
@@ -0,0 +1,206 @@
+import json as _json
+import re as _re
+import typing as _typing
+
+_WS = _re.compile(rb"[ \t\n\r]*")
+# the remainder of a string after its opening quote, escapes included
+_STRING_REST = _re.compile(rb'(?:[^"\\]++|\\.)*+"', _re.S)
+_STRING = _re.compile(rb'"(?:[^"\\]++|\\.)*+"', _re.S)
+_TOKEN = _re.compile(rb'"(?:[^"\\]++|\\.)*+"|[\[\]{}]', _re.S)
+# the longest prefix that does not end inside a string
+_STRING_SAFE = _re.compile(rb'(?:[^"]++|"(?:[^"\\]++|\\.)*+")*+', _re.S)
+_BALANCED = _re.compile(rb"(?:\[\]|\{\})+")
+_NON_BRACKETS = bytes(b for b in range(256) if b not in b"[]{}")
+# containers are scanned in windows growing from 1 KiB to 256 KiB
+_MIN_CHUNK = 1 << 10
+_MAX_CHUNK = 1 << 18
+_SCALAR_END = _re.compile(rb"[,\]}\s]|\Z")
+
+_MISSING = object()
+
+
+class _JsonScanner:
+    """
+    Navigates raw JSON bytes without building the skipped values.
+
+    Containers are skipped by counting brackets outside strings, so unrelated
+    subtrees cost a byte scan instead of a parse.
+    """
+
+    def __init__(self, buf):
+        self.buf = buf
+
+    def ws(self, pos: int) -> int:
+        return _WS.match(self.buf, pos).end()
+
+    def char(self, pos: int) -> bytes:
+        return bytes(self.buf[pos : pos + 1])
+
+    def skip_string(self, pos: int) -> int:
+        m = _STRING_REST.match(self.buf, pos + 1)
+        if m is None:
+            raise ValueError(f"Unterminated string at {pos}")
+        return m.end()
+
+    def skip_value(self, pos: int) -> int:
+        c = self.char(pos)
+        if c == b'"':
+            return self.skip_string(pos)
+        if c not in (b"{", b"["):
+            return _SCALAR_END.search(self.buf, pos).start()
+
+        return self.skip_container(pos)
+
+    def brackets(self, pos: int, end: int) -> _typing.Tuple[int, bytes]:
+        """
+        Return ``(cut, brackets)``: the brackets outside strings in
+        ``buf[pos:cut]``, where ``cut <= end`` never falls inside a string.
+        """
+        chunk = bytes(self.buf[pos:end])
+        if b"\\" not in chunk:
+            # without escapes every quote toggles, so odd parts are strings
+            parts = chunk.split(b'"')
+            if len(parts) % 2 == 0:
+                parts.pop()
+                end = pos + chunk.rfind(b'"')
+            outside = b"".join(parts[::2])
+        else:
+            end = _STRING_SAFE.match(self.buf, pos, end).end()
+            outside = _STRING.sub(b"", self.buf[pos:end])
+        return end, outside.translate(None, _NON_BRACKETS)
+
+    def walk(self, pos: int, end: int, depth: int) -> _typing.Tuple[int, int]:
+        """
+        Walk the tokens from ``pos`` until ``depth`` drops to zero or a token
+        ends past ``end``. Returns the position reached and the new depth.
+        """
+        for m in _TOKEN.finditer(self.buf, pos):
+            c = m.group()
+            if c[:1] != b'"':
+                depth += 1 if c in b"[{" else -1
+            if depth == 0 or m.end() >= end:
+                return m.end(), depth
+        raise ValueError(f"Unterminated container at {pos}")
+
+    def skip_container(self, pos: int) -> int:
+        """
+        Skip the container at ``pos``.
+
+        Small containers are walked token by token. Past the first window,
+        balanced pairs of each chunk are cancelled out at C speed and only the
+        chunk where the container closes is walked.
+        """
+        pos, depth = self.walk(pos, pos + _MIN_CHUNK, 0)
+        size = len(self.buf)
+        chunk = _MIN_CHUNK
+        while depth:
+            chunk = min(chunk * 2, _MAX_CHUNK)
+            cut, brackets = self.brackets(pos, min(pos + chunk, size))
+            if cut == pos:
+                # a string longer than the chunk
+                pos = self.skip_string(pos)
+                continue
+            count = -1
+            while count:
+                brackets, count = _BALANCED.subn(b"", brackets)
+            closes = len(brackets) - len(brackets.lstrip(b"]}"))
+            if closes < depth:
+                depth += len(brackets) - 2 * closes
+                pos = cut
+            else:
+                pos, depth = self.walk(pos, cut, depth)
+        return pos
+
+    def member(self, pos: int, key: str) -> int:
+        """Return the value position of ``key`` in the object at ``pos``."""
+        pos = self.ws(pos + 1)
+        while self.char(pos) == b'"':
+            end = self.skip_string(pos)
+            raw = bytes(self.buf[pos + 1 : end - 1])
+            name = (
+                _json.loads(bytes(self.buf[pos:end])) if b"\\" in raw else raw.decode()
+            )
+            pos = self.ws(end)
+            if self.char(pos) != b":":
+                raise ValueError(f"Expected ':' at {pos}")
+            pos = self.ws(pos + 1)
+            if name == key:
+                return pos
+            pos = self.ws(self.skip_value(pos))
+            if self.char(pos) != b",":
+                break
+            pos = self.ws(pos + 1)
+        raise KeyError(f"Key {key} not found in dictionary")
+
+    def element(self, pos: int, index: int) -> int:
+        """Return the value position of ``index`` in the array at ``pos``."""
+        pos = self.ws(pos + 1)
+        if self.char(pos) == b"]":
+            raise KeyError(f"Index {index} out of range for list")
+        for _ in range(index):
+            pos = self.ws(self.skip_value(pos))
+            if self.char(pos) != b",":
+                raise KeyError(f"Index {index} out of range for list")
+            pos = self.ws(pos + 1)
+        return pos
+
+    def find(self, keys) -> _typing.Any:
+        pos = self.ws(0)
+        for key in keys:
+            c = self.char(pos)
+            if c == b"{":
+                pos = self.member(pos, str(key))
+            elif c == b"[":
+                try:
+                    index = int(key)
+                except ValueError:
+                    raise KeyError(f"Index {key} is not an integer")
+                if index < 0:
+                    raise KeyError(f"Negative index {key} is not supported")
+                pos = self.element(pos, index)
+            else:
+                raise KeyError(f"Key {key} not found in scalar value")
+        return _json.loads(bytes(self.buf[pos : self.skip_value(pos)]))
+
+
+def load_path(
+    path: str,
+    key: _typing.Union[str, _typing.Sequence],
+    default: _typing.Any = _MISSING,
+    sep: str = ".",
+    **kwargs,
+):
+    """
+    Extract one nested value from a file without loading the whole document.
+
+    For JSON files the document is memory-mapped and scanned: the scan stops
+    as soon as the target is found and skips unrelated subtrees without
+    building objects. Other formats are fully loaded and traversed.
+
+    Args:
+        path (str): The file path.
+        key (str | Sequence): A dotted key such as ``"a.b.0.c"`` (the
+            ``zuu.UTILS.nested_dict`` convention) or a sequence of keys.
+        default (Any, optional): Returned when the key is missing instead of
+            raising ``KeyError``.
+        sep (str, optional): The separator of dotted keys. Defaults to ".".
+        **kwargs: Passed to :func:`zuu.io.load` for non-JSON files.
+
+    Example:
+        >>> load_path("manifest.json", "version")
+        '1.2.0'
+    """
+    from zuu.io import load, load_mapped, strip_compression
+    from zuu.UTILS.traverse import get_deep
+
+    keys = key.split(sep) if isinstance(key, str) else list(key)
+
+    try:
+        if not strip_compression(path).endswith(".json"):
+            return get_deep(load(path, **kwargs), *keys)
+        with load_mapped(path) as view:
+            return _JsonScanner(view).find(keys)
+    except KeyError:
+        if default is _MISSING:
+            raise
+        return default
@@ -0,0 +1,229 @@
+import os as _os
+import typing as _typing
+
+from .compress import strip_compression
+
+
+class _SuffixValidator:
+    """
+    Legacy-style validator produced by :meth:`FormatRegistry.register`.
+
+    Calling it behaves like ``path.endswith(suffix)`` (compression suffix
+    skipped) combined with the optional ``check``; the registry reads
+    ``suffix`` and ``check`` directly to build its index.
+    """
+
+    __slots__ = ("suffix", "check", "priority")
+
+    def __init__(self, suffix: str, check, priority: int):
+        self.suffix = suffix
+        self.check = check
+        self.priority = priority
+
+    def __call__(self, path: str, *args) -> bool:
+        return strip_compression(path).endswith(self.suffix) and (
+            self.check is None or self.check(path, *args)
+        )
+
+
+class _Sniffer:
+    """
+    Validator produced by :meth:`FormatRegistry.register_sniffer`.
+    """
+
+    __slots__ = ("sniffer", "priority")
+
+    def __init__(self, sniffer, priority: int):
+        self.sniffer = sniffer
+        self.priority = priority
+
+    def __call__(self, path: str, *args) -> bool:
+        return self.sniffer(path, *args)
+
+
+class FormatRegistry(list):
+    """
+    A suffix-indexed dispatch table for file loaders and dumpers.
+
+    The registry is a list of ``[validator, handler]`` pairs, so it can be
+    indexed, mutated and extended like a legacy ``_seq`` list. Handlers
+    registered for a suffix are found with a single dict lookup and tried in
+    priority order. Sniffers, which may inspect file contents, are kept after
+    the suffix handlers and only consulted once those have been ruled out.
+    Pairs added with plain list methods are tried in their list position.
+    """
+
+    def __init__(self, pairs: _typing.Iterable = ()):
+        super().__init__(pairs)
+        self._index = None
+
+    def register(
+        self,
+        suffix: str,
+        handler: _typing.Callable,
+        priority: int = 0,
+        check: _typing.Optional[_typing.Callable] = None,
+    ):
+        """
+        Register a handler for a file suffix.
+
+        Args:
+            suffix (str): The file suffix including the dot, e.g. ``".json"``.
+            handler (Callable): The loader or dumper.
+            priority (int, optional): Higher priorities are tried first. Defaults to 0.
+            check (Callable, optional): Extra predicate with the legacy validator signature.
+        """
+        pos = len(self)
+        for i, (validator, _) in enumerate(self):
+            if isinstance(validator, _Sniffer) or (
+                isinstance(validator, _SuffixValidator)
+                and validator.priority < priority
+            ):
+                pos = i
+                break
+        self.insert(pos, [_SuffixValidator(suffix, check, priority), handler])
+
+    def register_sniffer(
+        self, sniffer: _typing.Callable, handler: _typing.Callable, priority: int = 0
+    ):
+        """
+        Register a content-based fallback used when no suffix handler applies.
+
+        Args:
+            sniffer (Callable): Predicate with the legacy validator signature.
+            handler (Callable): The loader or dumper.
+            priority (int, optional): Higher priorities are tried first. Defaults to 0.
+        """
+        pos = len(self)
+        for i, (validator, _) in enumerate(self):
+            if isinstance(validator, _Sniffer) and validator.priority < priority:
+                pos = i
+                break
+        self.insert(pos, [_Sniffer(sniffer, priority), handler])
+
+    def unregister(
+        self, suffix: str, handler: _typing.Optional[_typing.Callable] = None
+    ):
+        """
+        Remove the handlers of a suffix, or only ``handler`` if given.
+        """
+        self[:] = [
+            pair
+            for pair in self
+            if not (
+                isinstance(pair[0], _SuffixValidator)
+                and pair[0].suffix == suffix
+                and (handler is None or pair[1] is handler)
+            )
+        ]
+
+    def replace(self, suffix: str, handler: _typing.Callable):
+        """
+        Swap every handler of a suffix for ``handler``, keeping priorities and checks.
+
+        Sniffers pointing to one of the replaced handlers are switched as well.
+        """
+        old = set()
+        for pair in self:
+            if isinstance(pair[0], _SuffixValidator) and pair[0].suffix == suffix:
+                old.add(pair[1])
+                pair[1] = handler
+        for pair in self:
+            if isinstance(pair[0], _Sniffer) and pair[1] in old:
+                pair[1] = handler
+
+    def copy(self) -> "FormatRegistry":
+        # pairs are copied so replacing a handler does not leak into the original
+        return FormatRegistry([list(pair) for pair in self])
+
+    @property
+    def suffixes(self) -> _typing.List[str]:
+        return list(
+            dict.fromkeys(
+                v.suffix for v, _ in self if isinstance(v, _SuffixValidator)
+            )
+        )
+
+    def _build_index(self) -> dict:
+        # every suffix maps to its own pairs plus the suffix-less ones, in list order
+        suffixes = self.suffixes
+        index = {suffix: [] for suffix in suffixes}
+        index[None] = []
+        for pair in self:
+            validator = pair[0]
+            if isinstance(validator, _SuffixValidator):
+                index[validator.suffix].append(pair)
+            else:
+                for entries in index.values():
+                    entries.append(pair)
+        self._index = index
+        return index
+
+    def resolve(self, path: str, *args) -> _typing.Iterator[_typing.Callable]:
+        """
+        Lazily yield the handlers accepting ``path`` (and ``obj`` for dumpers).
+
+        Suffix handlers come first; sniffers are only evaluated if iteration
+        continues past them. A compression suffix is skipped, so ``data.json.gz``
+        dispatches like ``data.json``.
+        """
+        index = self._index
+        if index is None:
+            index = self._build_index()
+        suffix = _os.path.splitext(strip_compression(path))[1]
+        entries = index.get(suffix)
+        if entries is None:
+            entries = index[None]
+        for pair in entries:
+            validator = pair[0]
+            if isinstance(validator, _SuffixValidator):
+                if validator.check is None or validator.check(path, *args):
+                    yield pair[1]
+            elif validator(path, *args):
+                yield pair[1]
+
+    def __repr__(self):
+        sniffers = sum(not isinstance(v, _SuffixValidator) for v, _ in self)
+        return f"FormatRegistry(suffixes={self.suffixes}, sniffers={sniffers})"
+
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._index = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "append",
+    "extend",
+    "insert",
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+):
+    setattr(FormatRegistry, _name, _invalidating(_name))
+del _name
+
+
+def resolve(path: str, seq, *args) -> _typing.Iterator[_typing.Callable]:
+    """
+    Yield the handlers of ``seq`` accepting ``path``.
+
+    ``seq`` is either a :class:`FormatRegistry` or a legacy list of
+    ``[validator, handler]`` pairs.
+    """
+    if isinstance(seq, FormatRegistry):
+        return seq.resolve(path, *args)
+    return (handler for validator, handler in seq if validator(path, *args))
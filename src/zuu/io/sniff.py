@@ -0,0 +1,188 @@
+import re as _re
+import typing as _typing
+
+SNIFF_LIMIT = 4096
+
+# tie-break order when two formats score the same
+_PREFERENCE = ("pickle", "xml", "json", "toml", "yaml", "csv")
+
+_JSON_VALUE_START = '{["-0123456789'
+_TOML_HEADER = _re.compile(r'\[\[?\s*[\w\-."\' ]+\s*\]\]?\s*(#.*)?')
+_TOML_PAIR = _re.compile(r'[\w\-."\']+\s*=\s*\S')
+_YAML_PAIR = _re.compile(r"(- )?[^\s#:\-\[{][^:]*:(\s|$)")
+_YAML_ITEM = _re.compile(r"- \S|-$")
+_DELIMITERS = (",", "\t", ";")
+
+
+def _head_text(data: _typing.Union[str, bytes, bytearray, memoryview], limit: int):
+    """Return ``(head, last_char, is_pickle)`` for the first ``limit`` units of data."""
+    if isinstance(data, str):
+        head = data[:limit]
+        tail = data.rstrip()[-1:] if len(data) > limit else ""
+        return head, tail, False
+
+    view = memoryview(data)
+    raw = view[:limit].tobytes()
+    # protocol 2+ pickles open with PROTO (0x80) followed by the protocol number
+    if raw[:1] == b"\x80" and raw[1:2] in (b"\x02", b"\x03", b"\x04", b"\x05"):
+        return "", "", True
+    tail = ""
+    if len(view) > limit:
+        end = len(view)
+        while end > limit and view[end - 1 : end].tobytes().isspace():
+            end -= 1
+        tail = view[end - 1 : end].tobytes().decode("latin-1")
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    return raw.decode("utf-8", errors="replace"), tail, False
+
+
+def _consistent_delimiter(counts: dict) -> _typing.Optional[str]:
+    """The first delimiter occurring equally often, and at all, on every line."""
+    for delimiter, perLine in counts.items():
+        if perLine and perLine[0] and all(c == perLine[0] for c in perLine):
+            return delimiter
+    return None
+
+
+def sniff_delimiter(text: str, limit: int = SNIFF_LIMIT) -> _typing.Optional[str]:
+    """
+    Return the csv delimiter (``,``, tab or ``;``) of ``text``, or None.
+    """
+    head = text[:limit]
+    lines = head.splitlines()
+    if len(head) >= limit and len(lines) > 1:
+        lines = lines[:-1]
+    counts = {delimiter: [] for delimiter in _DELIMITERS}
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#"):
+            for delimiter, perLine in counts.items():
+                perLine.append(line.count(delimiter))
+    return _consistent_delimiter(counts)
+
+
+def _json_score(head: str, last: str) -> float:
+    start = len(head) - len(head.lstrip())
+    if start >= len(head):
+        return 0.0
+    first = head[start]
+    closing = {"{": "}", "[": "]"}.get(first)
+    if closing is None or last != closing:
+        return 0.0
+    rest = head[start + 1 :].lstrip()
+    if first == "{":
+        return 0.95 if rest[:1] in ('"', "}") else 0.0
+    if rest[:1] and rest[0] in _JSON_VALUE_START + "]":
+        return 0.95
+    if rest.startswith(("true", "false", "null")):
+        return 0.9
+    return 0.0
+
+
+def sniff(
+    data: _typing.Union[str, bytes, bytearray, memoryview], limit: int = SNIFF_LIMIT
+) -> _typing.List[_typing.Tuple[str, float]]:
+    """
+    Guess the serialization format of a payload without parsing it.
+
+    Only the first ``limit`` characters (or bytes) and the last
+    non-whitespace character are inspected.
+
+    Args:
+        data (str | bytes | memoryview): The payload.
+        limit (int, optional): How much of the payload to inspect. Defaults to 4096.
+
+    Returns:
+        list: ``(format, confidence)`` pairs, most likely first. Formats are
+        ``"json"``, ``"xml"``, ``"pickle"``, ``"toml"``, ``"yaml"`` and ``"csv"``.
+
+    Example:
+        >>> sniff('{"a": 1}')
+        [('json', 0.95), ('yaml', 0.5)]
+    """
+    head, last, is_pickle = _head_text(data, limit)
+    if is_pickle:
+        return [("pickle", 1.0)]
+
+    if not last:
+        stripped = head.rstrip()
+        last = stripped[-1:]
+    # the head may be cut mid-line, so the last partial line is ignored
+    lines = head.splitlines()
+    if len(head) >= limit and len(lines) > 1:
+        lines = lines[:-1]
+
+    scores = {}
+    lstripped = head.lstrip()
+
+    if lstripped.startswith("<") and last == ">":
+        scores["xml"] = 1.0 if lstripped.startswith("<?xml") else 0.9
+
+    json_score = _json_score(head, last)
+    if json_score:
+        scores["json"] = json_score
+        # every JSON document is valid YAML
+        scores["yaml"] = 0.5
+
+    toml_hits = yaml_hits = 0
+    counted = 0
+    delimiter_counts = {delimiter: [] for delimiter in _DELIMITERS}
+    for line in lines:
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        counted += 1
+        if _TOML_HEADER.fullmatch(text) or _TOML_PAIR.match(text):
+            toml_hits += 1
+        if _YAML_PAIR.match(text) or _YAML_ITEM.match(text) or text == "---":
+            yaml_hits += 1
+        for delimiter, counts in delimiter_counts.items():
+            counts.append(line.count(delimiter))
+
+    if counted and "json" not in scores and "xml" not in scores:
+        if toml_hits:
+            scores["toml"] = 0.9 * toml_hits / counted
+        if yaml_hits:
+            yaml_score = 0.85 * yaml_hits / counted
+            if lstripped.startswith("---"):
+                yaml_score = max(yaml_score, 0.9)
+            scores["yaml"] = yaml_score
+        if counted > 1 and _consistent_delimiter(delimiter_counts):
+            scores["csv"] = 0.8
+
+    return sorted(
+        ((fmt, score) for fmt, score in scores.items() if score > 0),
+        key=lambda item: (-item[1], _PREFERENCE.index(item[0])),
+    )
+
+
+def sniff_format(
+    data: _typing.Union[str, bytes, bytearray, memoryview], limit: int = SNIFF_LIMIT
+) -> _typing.Optional[str]:
+    """
+    Return the most likely format of a payload, or None if nothing matches.
+    """
+    ranked = sniff(data, limit)
+    return ranked[0][0] if ranked else None
+
+
+class sniffed:
+    """
+    A ``loads`` validator accepting payloads that :func:`sniff` ranks as ``format``.
+
+    When every validator of a ``_seq`` table is a :class:`sniffed`,
+    :func:`zuu.io.loads` sniffs the payload once and tries the loaders in
+    confidence order instead of evaluating each validator.
+    """
+
+    __slots__ = ("format",)
+
+    def __init__(self, format: str):
+        self.format = format
+
+    def __call__(self, s) -> bool:
+        return any(fmt == self.format for fmt, _ in sniff(s))
+
+    def __repr__(self):
+        return f"sniffed({self.format!r})"
@@ -0,0 +1,165 @@
+import hashlib as _hashlib
+import os as _os
+import secrets as _secrets
+import shutil as _shutil
+from contextlib import contextmanager as _contextmanager
+
+from .compress import compression_of, wrap_compressed
+
+WRITE_OPTIONS = ("atomic", "fsync", "buffering", "skip_unchanged", "compresslevel")
+
+# abspath -> (st_mtime_ns, st_size, digest) of the last content written by us
+_digests: dict = {}
+
+
+def pop_write_options(kwargs: dict) -> dict:
+    """
+    Pop the :func:`open_write` options out of a dumper's kwargs.
+    """
+    return {k: kwargs.pop(k) for k in WRITE_OPTIONS if k in kwargs}
+
+
+def _create_temp(dirname: str, basename: str):
+    """
+    Create a unique temporary file next to the target.
+
+    Unlike ``tempfile.mkstemp`` (mode 0o600) the file is created with mode
+    0o666, so the kernel applies the process umask as for a plain ``open``.
+    """
+    flags = _os.O_CREAT | _os.O_EXCL | _os.O_WRONLY | getattr(_os, "O_BINARY", 0)
+    while True:
+        tmp = _os.path.join(dirname, f".{basename}.{_secrets.token_hex(4)}.tmp")
+        try:
+            return _os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def _file_digest(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return _hashlib.file_digest(f, "blake2b").digest()
+
+
+def _stored_digest(path: str, st: _os.stat_result) -> bytes:
+    cached = _digests.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    return _file_digest(path)
+
+
+def _remember(path: str, digest: bytes):
+    st = _os.stat(path)
+    _digests[path] = (st.st_mtime_ns, st.st_size, digest)
+
+
+def _fsync_dir(dirname: str):
+    if _os.name == "nt":
+        return
+    fd = _os.open(dirname, _os.O_RDONLY)
+    try:
+        _os.fsync(fd)
+    finally:
+        _os.close(fd)
+
+
+@_contextmanager
+def _opened(file, mode, buffering, fsync, codec, compresslevel, openKwargs):
+    if codec is None:
+        with open(file, mode, buffering, **openKwargs) as f:
+            yield f
+            if fsync:
+                f.flush()
+                _os.fsync(f.fileno())
+        return
+
+    rawKwargs = {
+        k: v
+        for k, v in openKwargs.items()
+        if k not in ("encoding", "errors", "newline")
+    }
+    with open(file, "wb", buffering, **rawKwargs) as raw:
+        with wrap_compressed(raw, codec, mode, compresslevel, **openKwargs) as f:
+            yield f
+        if fsync:
+            raw.flush()
+            _os.fsync(raw.fileno())
+
+
+@_contextmanager
+def open_write(
+    path: str,
+    mode: str = "w",
+    atomic: bool = False,
+    fsync: bool = False,
+    buffering: int = -1,
+    skip_unchanged: bool = False,
+    compresslevel: int | None = None,
+    **openKwargs,
+):
+    """
+    Open a file for writing with optional crash safety.
+
+    Paths ending in a compression suffix (``.gz``, ``.bz2``, ``.xz``, ``.zst``)
+    are compressed on the fly.
+
+    Args:
+        path (str): The target file path.
+        mode (str, optional): The open mode. Defaults to "w".
+        atomic (bool, optional): Write to a temporary file in the same directory
+            and rename it over ``path`` on success, so readers never observe a
+            truncated file. Defaults to False.
+        fsync (bool, optional): Flush the data (and, for atomic writes, the
+            directory entry) to disk before returning. Defaults to False.
+        buffering (int, optional): The write buffer size passed to ``open``. Defaults to -1.
+        skip_unchanged (bool, optional): Leave ``path`` untouched when the new
+            content hashes the same as the current file. Implies ``atomic``.
+            Defaults to False.
+        compresslevel (int, optional): Level (or lzma preset) for compressed
+            paths. Defaults to the codec default.
+
+    Yields:
+        The open file object.
+    """
+    codec = compression_of(path)
+    if not (atomic or skip_unchanged):
+        with _opened(
+            path, mode, buffering, fsync, codec, compresslevel, openKwargs
+        ) as f:
+            yield f
+        return
+
+    path = _os.path.abspath(path)
+    dirname, basename = _os.path.split(path)
+    fd, tmp = _create_temp(dirname, basename)
+    try:
+        with _opened(fd, mode, buffering, fsync, codec, compresslevel, openKwargs) as f:
+            yield f
+
+        if skip_unchanged:
+            digest = _file_digest(tmp)
+            try:
+                st = _os.stat(path)
+            except FileNotFoundError:
+                st = None
+            if (
+                st is not None
+                and st.st_size == _os.path.getsize(tmp)
+                and _stored_digest(path, st) == digest
+            ):
+                _os.unlink(tmp)
+                _digests[path] = (st.st_mtime_ns, st.st_size, digest)
+                return
+
+        if _os.path.exists(path):
+            _shutil.copymode(path, tmp)
+        _os.replace(tmp, path)
+        if fsync:
+            _fsync_dir(dirname)
+        if skip_unchanged:
+            _remember(path, digest)
+    except BaseException:
+        try:
+            _os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,201 @@
+import os as _os
+import struct as _struct
+import typing as _typing
+
+from .compress import compression_of, open_read
+from .write import open_write, pop_write_options as _pop_write_options
+
+# "ZBIN" + format version, followed by one codec byte
+ZBIN_MAGIC = b"ZBIN\x01"
+ZBIN_CODECS = {None: 0, "zlib": 1, "lzma": 2}
+_CODEC_NAMES = {v: k for k, v in ZBIN_CODECS.items()}
+_FRAME = _struct.Struct(">I")
+
+
+# ANCHOR msgpack
+def iter_msgpack(path: str, **kwargs):
+    """
+    Lazily yield every object of a file of concatenated msgpack objects.
+    """
+    import msgpack
+
+    openKwargs = kwargs.pop("open", {})
+    loadKwargs = kwargs.pop("load", {})
+    loadKwargs.setdefault("strict_map_key", False)
+    with open_read(path, "rb", **openKwargs) as f:
+        yield from msgpack.Unpacker(f, **loadKwargs, **kwargs)
+
+
+def load_msgpack(path: str, **kwargs):
+    """
+    Return the first object of a msgpack file, i.e. the object written by
+    :func:`dump_msgpack`. Use ``iter_load`` to read appended objects.
+    """
+    for obj in iter_msgpack(path, **kwargs):
+        return obj
+    raise ValueError("Empty msgpack file")
+
+
+def dump_msgpack(obj, path: str, **kwargs):
+    import msgpack
+
+    openKwargs = kwargs.pop("open", {})
+    dumpKwargs = kwargs.pop("dump", {})
+    writeOptions = _pop_write_options(kwargs)
+    data = msgpack.packb(obj, **dumpKwargs, **kwargs)
+    with open_write(path, "wb", **writeOptions, **openKwargs) as f:
+        f.write(data)
+
+
+def append_msgpack(obj, path: str, **kwargs):
+    """
+    Append one object to a msgpack stream, read back with :func:`iter_msgpack`.
+    """
+    import msgpack
+
+    dumpKwargs = kwargs.pop("dump", {})
+    if compression_of(path):
+        raise ValueError(f"Cannot append to compressed file: {path}")
+    with open(path, "ab") as f:
+        f.write(msgpack.packb(obj, **dumpKwargs, **kwargs))
+
+
+def loads_msgpack(s: bytes, **kwargs):
+    import msgpack
+
+    kwargs.setdefault("strict_map_key", False)
+    return msgpack.unpackb(s, **kwargs)
+
+
+def dumps_msgpack(obj, **kwargs):
+    import msgpack
+
+    return msgpack.packb(obj, **kwargs)
+
+
+# ANCHOR zbin
+def _compress(data: bytes, codec: int, level: _typing.Optional[int]) -> bytes:
+    if codec == 1:
+        import zlib
+
+        return zlib.compress(data, -1 if level is None else level)
+    if codec == 2:
+        import lzma
+
+        return lzma.compress(data, preset=level)
+    return data
+
+
+def _decompress(data: bytes, codec: int) -> bytes:
+    if codec == 1:
+        import zlib
+
+        return zlib.decompress(data)
+    if codec == 2:
+        import lzma
+
+        return lzma.decompress(data)
+    return data
+
+
+def _codec_id(compression: _typing.Optional[str]) -> int:
+    if compression not in ZBIN_CODECS:
+        raise ValueError(f"compression must be one of {tuple(ZBIN_CODECS)}")
+    return ZBIN_CODECS[compression]
+
+
+def _frame(obj, codec: int, level, packKwargs: dict) -> bytes:
+    import msgpack
+
+    payload = _compress(msgpack.packb(obj, **packKwargs), codec, level)
+    return _FRAME.pack(len(payload)) + payload
+
+
+def _read_header(f) -> int:
+    header = f.read(len(ZBIN_MAGIC) + 1)
+    if header[: len(ZBIN_MAGIC)] != ZBIN_MAGIC:
+        raise ValueError("Not a zbin file")
+    return header[-1]
+
+
+def dump_zbin(
+    obj,
+    path: str,
+    compression: _typing.Optional[str] = None,
+    level: _typing.Optional[int] = None,
+    **kwargs,
+):
+    """
+    Write ``obj`` as a single msgpack record of a zbin container.
+
+    Args:
+        compression (str, optional): ``"zlib"``, ``"lzma"`` or None. Defaults to None.
+        level (int, optional): Compression level or lzma preset. Defaults to the codec default.
+    """
+    codec = _codec_id(compression)
+    openKwargs = kwargs.pop("open", {})
+    dumpKwargs = kwargs.pop("dump", {})
+    writeOptions = _pop_write_options(kwargs)
+    data = _frame(obj, codec, level, {**dumpKwargs, **kwargs})
+    with open_write(path, "wb", **writeOptions, **openKwargs) as f:
+        f.write(ZBIN_MAGIC + bytes([codec]) + data)
+
+
+def append_zbin(
+    obj,
+    path: str,
+    compression: _typing.Optional[str] = None,
+    level: _typing.Optional[int] = None,
+    **kwargs,
+):
+    """
+    Append ``obj`` as a new record without rewriting the file.
+
+    New files are created with ``compression``; existing files keep the codec
+    recorded in their header.
+    """
+    dumpKwargs = kwargs.pop("dump", {})
+    if compression_of(path):
+        raise ValueError(f"Cannot append to compressed file: {path}")
+    with open(path, "ab+") as f:
+        if f.tell() == 0:
+            codec = _codec_id(compression)
+            f.write(ZBIN_MAGIC + bytes([codec]))
+        else:
+            f.seek(0)
+            codec = _read_header(f)
+            f.seek(0, _os.SEEK_END)
+        f.write(_frame(obj, codec, level, {**dumpKwargs, **kwargs}))
+
+
+def iter_zbin(path: str, **kwargs):
+    """
+    Lazily yield every record of a zbin container.
+    """
+    import msgpack
+
+    openKwargs = kwargs.pop("open", {})
+    loadKwargs = kwargs.pop("load", {})
+    loadKwargs.setdefault("strict_map_key", False)
+    with open_read(path, "rb", **openKwargs) as f:
+        codec = _read_header(f)
+        if codec not in _CODEC_NAMES:
+            raise ValueError(f"Unknown zbin codec: {codec}")
+        while size := f.read(_FRAME.size):
+            if len(size) < _FRAME.size:
+                raise ValueError("Truncated zbin frame")
+            (length,) = _FRAME.unpack(size)
+            payload = f.read(length)
+            if len(payload) < length:
+                raise ValueError("Truncated zbin frame")
+            yield msgpack.unpackb(_decompress(payload, codec), **loadKwargs, **kwargs)
+
+
+def load_zbin(path: str, **kwargs):
+    """
+    Return the first record of a zbin container, i.e. the object written by
+    :func:`dump_zbin`. Use ``iter_load`` to read appended records.
+    """
+    for record in iter_zbin(path, **kwargs):
+        return record
+    raise ValueError("Empty zbin file")
@@ -58,7 +58,150 @@ def test_match_c(setup_query : AdvancedQuery):
     query.handle(ctx,'func(test_func)', cache=cache)
     assert ctx.result == 'function_result'
 
+def test_any_and_all_short_circuit():
+    query = AdvancedQuery()
+    calls = []
+
+    def tracked(name, result):
+        def func(string : str):
+            calls.append(name)
+            return result
+        return func
+
+    group_any = query.matcher(any=True)(tracked("a1", False))
+    group_any.matcher()(tracked("a2", True))
+    group_any.matcher()(tracked("a3", True))
+    group_all = query.matcher(any=False)(tracked("b1", False))
+    group_all.matcher()(tracked("b2", True))
+
+    ctx = query.match("item", AQCtx())
+    assert ctx.matchmap == {0: True, 1: False}
+    assert calls == ["a1", "a2", "b1"]
+
+def test_shared_matchers_run_once_per_item():
+    query = AdvancedQuery()
+    calls = []
+
+    @query.matcher()
+    def is_dir(string : str):
+        return string.startswith("dir(")
+
+    @query.matcher()
+    def is_file(string : str):
+        return string.startswith("file(")
+
+    @query.appendToAllMatcher()
+    def closed(ctx : AQCtx, string : str):
+        calls.append(ctx)
+        return string.endswith(")")
+
+    ctx = query.match("x)", AQCtx())
+    assert ctx.matchmap == {0: True, 1: True}
+    assert calls == [ctx]
+
+def test_registration_recompiles(setup_query : AdvancedQuery):
+    query = setup_query
+    query.compile()
+
+    @query.matcher()
+    def match_d(string : str):
+        return string == "d"
+
+    @match_d.handler()
+    def handle_d(ctx : AQCtx, **kwargs):
+        return "handled"
+
+    ctx = AQCtx()
+    query.handle(ctx, "d")
+    assert ctx.result == "handled"
+    with pytest.raises(AttributeError):
+        ctx.extra = 1
+
+def is_even(number : int):
+    return number % 2 == 0
+
+def halve(ctx : AQCtx, **kwargs):
+    return ctx.result // 2
+
+def build_halving_query():
+    query = AdvancedQuery()
+    query.matcher()(is_even).handler()(halve)
+    return query
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+@pytest.mark.parametrize("ordered", [True, False])
+def test_run_streams_items(mode : str, ordered : bool):
+    query = build_halving_query()
+    expected = [n // 2 if n % 2 == 0 else n for n in range(1, 200)]
+
+    results = list(query.run(range(1, 200), workers=3, mode=mode, ordered=ordered, batch=16))
+    assert results == expected if ordered else sorted(results) == sorted(expected)
+
+def test_run_memoizes_matches_by_key():
+    query = AdvancedQuery()
+    calls = []
+
+    @query.matcher()
+    def is_upper(string : str):
+        calls.append(string)
+        return string.isupper()
+
+    @is_upper.handler()
+    def mark(ctx : AQCtx, **kwargs):
+        return ctx.result + "!"
+
+    items = ["A", "b", "A", "b", "A"]
+    assert list(query.run(items, workers=1, key=str)) == ["A!", "b", "A!", "b", "A!"]
+    assert calls == ["A", "b"]
+
+def test_run_async():
+    import asyncio
+
+    query = AdvancedQuery()
+
+    @query.matcher()
+    async def is_dir(string : str):
+        await asyncio.sleep(0)
+        return string.startswith("dir(")
+
+    @is_dir.handler()
+    async def resolve(ctx : AQCtx, cache : dict, **kwargs):
+        await asyncio.sleep(0.01 if ctx.result == "dir(a)" else 0)
+        return cache[ctx.result[4:-1]]
+
+    with pytest.raises(ValueError):
+        query.run(["dir(a)"], mode="thread")
+
+    async def collect(ordered):
+        items = ["dir(a)", "x", "dir(b)"]
+        return [r async for r in query.run(items, workers=2, mode="async", ordered=ordered, cache={"a": 1, "b": 2})]
+
+    assert asyncio.run(collect(True)) == [1, "x", 2]
+    assert sorted(map(str, asyncio.run(collect(False)))) == ["1", "2", "x"]
+
+# registered with decorators, which rebind these module names
+spawn_query = AdvancedQuery()
+
+@spawn_query.matcher()
+def is_odd(number : int):
+    return number % 2 == 1
 
+@is_odd.handler()
+def triple(ctx : AQCtx, **kwargs):
+    return ctx.result * 3
 
+def test_run_process_spawn(monkeypatch):
+    import functools
+    import multiprocessing
+    import zuu.UTILS.advanced_query as advanced_query
 
-        
\ No newline at end of file
+    monkeypatch.setattr(
+        advanced_query,
+        "ProcessPoolExecutor",
+        functools.partial(
+            advanced_query.ProcessPoolExecutor,
+            mp_context=multiprocessing.get_context("spawn"),
+        ),
+    )
+    results = list(spawn_query.run(range(10), workers=2, mode="process", batch=4))
+    assert results == [n * 3 if n % 2 else n for n in range(10)]
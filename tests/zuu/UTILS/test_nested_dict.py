@@ -0,0 +1,73 @@
+import pytest
+from zuu.UTILS.nested_dict import (
+    flatten_nested_dict,
+    iter_flatten,
+    parse_dotted_dict,
+    parse_dotted_items,
+    split_dotted_key,
+)
+
+
+def test_flatten_nested_dict():
+    data = {"a": {"b": 1, "c": {"d": 2}}, "e": [1, {"f": 3}], "g": {}}
+    assert flatten_nested_dict(data) == {"a.b": 1, "a.c.d": 2, "e": [1, {"f": 3}]}
+    assert flatten_nested_dict(data, sep="/", parent_key="root") == {
+        "root/a/b": 1,
+        "root/a/c/d": 2,
+        "root/e": [1, {"f": 3}],
+    }
+
+
+def test_flatten_lists_and_tuples():
+    data = {"a": [1, {"b": (2, 3)}]}
+    assert flatten_nested_dict(data, lists=True) == {
+        "a.0": 1,
+        "a.1.b.0": 2,
+        "a.1.b.1": 3,
+    }
+
+
+def test_iter_flatten_is_lazy_and_ordered():
+    it = iter_flatten({"a": {"b": 1}, "c": 2})
+    assert next(it) == ("a.b", 1)
+    assert list(it) == [("c", 2)]
+
+
+def test_flatten_deep_document():
+    data = node = {}
+    for _ in range(5000):
+        node["k"] = {}
+        node = node["k"]
+    node["v"] = 1
+    ((key, value),) = iter_flatten(data)
+    assert key == ".".join(["k"] * 5000 + ["v"])
+    assert value == 1
+
+
+def test_escape_round_trip():
+    data = {"a.b": {"c\\d": 1, "e": 2}}
+    flat = flatten_nested_dict(data, escape="\\")
+    assert flat == {"a\\.b.c\\\\d": 1, "a\\.b.e": 2}
+    assert parse_dotted_dict(flat, escape="\\") == data
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [("a.b", ["a", "b"]), ("a\\.b", ["a.b"]), ("a\\\\.b", ["a\\", "b"]), ("", [""])],
+)
+def test_split_dotted_key(key, expected):
+    assert split_dotted_key(key, escape="\\") == expected
+
+
+def test_parse_dotted_dict():
+    data = {"a.b": 1, "a.c.d": 2, "e": 3}
+    assert parse_dotted_dict(data) == {"a": {"b": 1, "c": {"d": 2}}, "e": 3}
+    assert parse_dotted_dict({"a/b": 1}, sep="/") == {"a": {"b": 1}}
+
+
+def test_parse_dotted_items_streams():
+    pairs = (("x.%d.v" % (i // 2), i) for i in range(4))
+    result = parse_dotted_items(pairs, into={"y": 0})
+    assert result == {"y": 0, "x": {"0": {"v": 1}, "1": {"v": 3}}}
+    flat = iter_flatten({"a": {"b": 1, "c": {"d": 2}}})
+    assert parse_dotted_items(flat) == {"a": {"b": 1, "c": {"d": 2}}}
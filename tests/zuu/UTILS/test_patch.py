@@ -0,0 +1,81 @@
+import copy
+import json
+
+import pytest
+from zuu.UTILS import apply_patch, diff
+
+
+@pytest.fixture
+def doc():
+    return {
+        "name": "app",
+        "deps": ["a", "b", "c"],
+        "config": {"debug": False, "ports": [80, 443], "nested": {"x": 1}},
+    }
+
+
+def roundtrip(old, new):
+    ops = diff(old, new)
+    assert apply_patch(copy.deepcopy(old), ops) == new
+    return ops
+
+
+def test_identical_documents(doc):
+    assert diff(doc, doc) == []
+    assert diff(doc, copy.deepcopy(doc)) == []
+
+
+def test_dict_changes(doc):
+    new = copy.deepcopy(doc)
+    new["config"]["debug"] = True
+    del new["name"]
+    new["version"] = 2
+    assert roundtrip(doc, new) == [
+        ("delete", ("name",)),
+        ("set", ("version",), 2),
+        ("set", ("config", "debug"), True),
+    ]
+
+
+def test_list_insert_and_delete(doc):
+    new = copy.deepcopy(doc)
+    new["deps"].insert(1, "z")
+    assert roundtrip(doc, new) == [("insert", ("deps", 1), "z")]
+
+    new = copy.deepcopy(doc)
+    del new["deps"][0]
+    assert roundtrip(doc, new) == [("delete", ("deps", 0))]
+
+    new = copy.deepcopy(doc)
+    new["config"]["ports"] = [8080, 443, 22]
+    assert roundtrip(doc, new) == [
+        ("insert", ("config", "ports", 2), 22),
+        ("set", ("config", "ports", 0), 8080),
+    ]
+
+
+def test_type_changes_replace_values():
+    assert roundtrip({"a": 1}, {"a": True}) == [("set", ("a",), True)]
+    assert roundtrip({"a": [1]}, {"a": {"0": 1}}) == [("set", ("a",), {"0": 1})]
+    assert roundtrip([1, 2], {"x": 1}) == [("set", (), {"x": 1})]
+
+
+def test_identity_short_circuit(doc):
+    class Exploding(dict):
+        def __eq__(self, other):
+            raise AssertionError("identical subtrees must not be compared")
+
+    shared = Exploding(a=1)
+    assert diff({"s": shared, "v": 1}, {"s": shared, "v": 2}) == [
+        ("set", ("v",), 2)
+    ]
+
+
+def test_apply_json_roundtripped_ops(doc):
+    new = copy.deepcopy(doc)
+    new["config"]["nested"]["y"] = [1]
+    new["deps"].append("d")
+    ops = json.loads(json.dumps(diff(doc, new)))
+    assert apply_patch(copy.deepcopy(doc), ops) == new
+    with pytest.raises(ValueError):
+        apply_patch({}, [["move", ["a"]]])
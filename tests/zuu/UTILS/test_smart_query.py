@@ -1,4 +1,5 @@
-from zuu.UTILS.smart_query import QueryObj as query
+from zuu.UTILS.smart_query import QueryObj as query, QueryCache, QueryIndex, QuerySet
+import re
 import pytest 
 
 class TestParse:
@@ -49,6 +50,34 @@ class TestParse:
         q = query.parse("(name contains test && id is 1) || title startswith demo")
         assert q.stats["isCompound"] is True
 
+    @staticmethod
+    def test_quoted_text_is_left_alone():
+        q = query.parse("x == 'a && b' and y == \"c is  d\"")
+        assert q.query == "x == 'a && b' and y == \"c is  d\""
+        assert query.parse("age != 3 && name is x").query == 'age != 3 and name == "x"'
+        assert query.parse("name pattern of a|b").query == 'REGEX(name, "a|b")'
+
+    @staticmethod
+    def test_pattern_of_in_compound_query():
+        q = query.parse("name pattern of a* && age > 3")
+        assert q.query == 'REGEX(name, "a*") and age > 3'
+        assert q.stats["isCompound"] is True
+        q = query.parse("(name pattern of (a|b)*) || id is 1")
+        assert q.query == '(REGEX(name, "(a|b)*")) or id == "1"'
+        q = query.parse("name pattern of J* && age is 5")
+        assert q.validate({"name": "John", "age": 5}) is True
+        assert q.validate({"name": "John", "age": 2}) is False
+
+    @staticmethod
+    def test_parse_is_cached():
+        from zuu.UTILS.smart_query import _parse_query
+
+        q1 = query.parse("name is " + "John")
+        q2 = query.parse("name is John", cache="none")
+        assert q1.query is q2.query
+        assert q1.stats == q2.stats and q1.stats is not q2.stats
+        assert _parse_query.cache_info().hits > 0
+
 
 class TestValidate:
     @staticmethod
@@ -108,4 +137,296 @@ class TestValidate:
             "name": "Jo",
             "age": 35,
             "title": "Developer"
-        }) 
\ No newline at end of file
+        }) 
+
+class TestCompile:
+    @staticmethod
+    @pytest.mark.parametrize("query_str", [
+        "name.__class__ is x",
+        "__import__('os')",
+        "open('f')",
+        "[y for y in name]",
+        "(lambda: 1)()",
+        "'{0.__class__}'.format(name)",
+        "'{n.__class__}'.format_map(x)",
+        "tags.clear() or True",
+        "tags.append(1) or True",
+    ])
+    def test_unsafe_queries_rejected(query_str):
+        with pytest.raises(ValueError):
+            query(query_str, {})
+
+    @staticmethod
+    def test_fields_and_builtins():
+        q = query.parse("len(name) > 3 and bio contains engineer")
+        assert q.fields == ("name", "bio")
+        assert q.validate({"name": "Johnny", "bio": "engineer"})
+        assert not q.validate({"name": "Jo", "bio": "engineer"})
+
+    @staticmethod
+    def test_missing_fields_short_circuit():
+        q = query.parse("name is John or age is 30")
+        assert q.validate({"name": "John"})
+        assert not q.validate({"name": "Alice"})
+
+    @staticmethod
+    def test_private_fields_hidden():
+        q = query("_secret == 'x'", {})
+        assert not q.validate({"_secret": "x"})
+        assert query("x['_secret'] == 'x'", {}).validate({"_secret": "x"})
+
+    @staticmethod
+    def test_fields_shadow_builtins_and_record():
+        assert query.parse("x is 5").validate({"x": 5})
+        assert query.parse("min is 3").validate({"min": 3})
+        assert not query.parse("min is 3").validate({"max": 3})
+        assert query.parse("len(x) == 2").validate({"a": 1, "b": 2})
+        assert query.parse("max(len(min), 1) == 3").validate({"min": "abc"})
+
+
+class TestCache:
+    @staticmethod
+    def test_keyed_on_referenced_fields():
+        q = query.parse("name is John")
+        assert q.validate({"name": "John", "n": 1})
+        assert q.validate({"name": "John", "n": 2})
+        assert q.cache.info()["hits"] == 1
+        assert q.cache.info()["size"] == 1
+
+    @staticmethod
+    def test_lru_is_bounded():
+        q = query.parse("name is John", cache=QueryCache(maxsize=2))
+        for name in ["a", "b", "c", "John"]:
+            q.validate({"name": name})
+        assert q.cache.info()["size"] == 2
+
+    @staticmethod
+    def test_ttl_expires(monkeypatch):
+        import zuu.UTILS.smart_query as smart_query
+
+        now = [100.0]
+        monkeypatch.setattr(smart_query.time, "monotonic", lambda: now[0])
+        q = query.parse("name is John", cache="ttl")
+        q.validate({"name": "John"})
+        q.validate({"name": "John"})
+        assert q.cache.info()["hits"] == 1
+        now[0] += smart_query.DEFAULT_CACHE_TTL + 1
+        q.validate({"name": "John"})
+        assert q.cache.info()["misses"] == 2
+
+    @staticmethod
+    def test_no_cache_and_unhashable_records():
+        q = query.parse("name is John", cache="none")
+        assert q.cache is None
+        assert q.validate({"name": "John"})
+
+        q = query.parse("tags contains a")
+        assert q.validate({"tags": ["a", "b"]})
+        assert q.cache.info()["size"] == 0
+        with pytest.raises(ValueError):
+            query.parse("name is John", cache="forever")
+
+    @staticmethod
+    def test_shared_cache():
+        shared = QueryCache()
+        q1 = query.parse("name is John", cache=shared)
+        q2 = query.parse("name is Alice", cache=shared)
+        assert q1.validate({"name": "John"})
+        assert not q2.validate({"name": "John"})
+
+
+class TestColumnar:
+    RECORDS = [
+        {"name": "John", "age": 30, "bio": "software engineer"},
+        {"name": "Jolyne", "age": 25, "bio": "doctor"},
+        {"name": "Alice", "age": 41, "bio": "engineer"},
+        {"name": "bob", "age": 30, "bio": "chef"},
+    ]
+    QUERIES = [
+        "name is John",
+        "name startswith Jo and bio contains engineer",
+        "age is 30 or name endswith e",
+        "not name pattern of J*",
+        "bio pattern of *engineer",
+        "J*",
+        "len(name) > 4",
+        "(name contains Jo or bio contains chef) and not bio contains doctor",
+        "name is John or missing is 1",
+        "x['name'] == 'bob'",
+    ]
+
+    @classmethod
+    def columns(cls):
+        return {key: [r[key] for r in cls.RECORDS] for key in cls.RECORDS[0]}
+
+    @classmethod
+    @pytest.mark.parametrize("query_str", QUERIES)
+    def test_mask_matches_validate(cls, query_str):
+        q = query.parse(query_str)
+        expected = [bool(q.validate(r)) for r in cls.RECORDS]
+        assert q.mask(cls.columns()) == expected
+
+    @classmethod
+    @pytest.mark.parametrize("query_str", QUERIES)
+    def test_mask_numpy(cls, query_str):
+        np = pytest.importorskip("numpy")
+        q = query.parse(query_str)
+        expected = [bool(q.validate(r)) for r in cls.RECORDS]
+        columns = {k: np.array(v) for k, v in cls.columns().items()}
+        result = q.mask(columns)
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == expected
+
+    @classmethod
+    def test_filter(cls):
+        q = query.parse("bio contains engineer")
+        assert [r["name"] for r in q.filter(cls.RECORDS)] == ["John", "Alice"]
+
+    @staticmethod
+    def test_mask_length_mismatch():
+        with pytest.raises(ValueError):
+            query.parse("name is a").mask({"name": ["a"], "bio": []})
+
+
+class TestPatterns:
+    @staticmethod
+    @pytest.mark.parametrize("pattern", [
+        "John", "Jo*", "*hn", "*oh*", "*", "J?hn", "J.*n", "[JB]ob", "a+b", "(x",
+    ])
+    @pytest.mark.parametrize("ignore_case", [False, True])
+    def test_matchers_agree_with_fullmatch(pattern, ignore_case):
+        from zuu.UTILS.smart_query import _glob_to_regex, _pattern_matcher
+
+        matcher = _pattern_matcher(pattern, ignore_case)
+        for value in ["John", "john", "Jo", "xJohnx", "Jo\nhn", "", "Bob", "ab", "(x"]:
+            try:
+                expected = (
+                    re.fullmatch(
+                        _glob_to_regex(pattern),
+                        value,
+                        re.IGNORECASE if ignore_case else 0,
+                    )
+                    is not None
+                )
+            except re.error:
+                expected = False
+            assert matcher(value) is expected, (pattern, value)
+
+    @staticmethod
+    def test_literal_patterns_are_bound_at_parse_time(monkeypatch):
+        import zuu.UTILS.smart_query as smart_query
+
+        q = query.parse("name pattern of Jo*")
+        monkeypatch.setattr(smart_query, "regex_func", None)
+        assert q.validate({"name": "John"})
+        assert not q.validate({"name": "Bob"})
+
+    @staticmethod
+    def test_dynamic_patterns_use_bounded_cache():
+        from zuu.UTILS.smart_query import PATTERN_CACHE_SIZE, _pattern_matcher
+
+        q = query("REGEX(name, pattern)", {})
+        assert q.validate({"name": "John", "pattern": "J*"})
+        assert not q.validate({"name": "John", "pattern": "B*"})
+        assert _pattern_matcher.cache_info().maxsize == PATTERN_CACHE_SIZE
+
+
+class TestPlanner:
+    RECORDS = [
+        {"name": f"{prefix}{i}", "cat": "abc"[i % 3], "age": i}
+        for i in range(300)
+        for prefix in ("John", "Alice")
+    ] + [{"cat": "a"}, "John"]
+
+    @classmethod
+    @pytest.mark.parametrize("query_str", [
+        "cat is a and name startswith John",
+        "name pattern of John1* ",
+        "cat is b and name is Alice7",
+        "CONTAINS(name, '9') and cat is c and not name endswith 0",
+        "cat is a or name is John",
+        "name is Alice1 and name.startswith('A')",
+    ])
+    def test_plan_and_index_match_validate(cls, query_str):
+        q = query.parse(query_str)
+        expected = [r for r in cls.RECORDS if q.validate(r)]
+        assert list(q.plan().filter(cls.RECORDS)) == expected
+        assert QueryIndex(cls.RECORDS).search(q) == expected
+
+    @staticmethod
+    def test_errors_follow_written_order():
+        q = query.parse("cat is a and name.startswith('J')")
+        records = [{"cat": "b", "name": None}] * 40
+        plan = q.plan()
+        plan.clauses.reverse()
+        plan.REORDER_INTERVAL = 8
+        assert not any(plan.validate(r) for r in records)
+
+    @staticmethod
+    def test_reorders_selective_clauses_first():
+        q = query.parse("cat is a and name is John7")
+        plan = q.plan()
+        plan.SAMPLE_INTERVAL = 1
+        plan.REORDER_INTERVAL = 16
+        for i in range(64):
+            plan.validate({"cat": "a", "name": f"John{i}"})
+        assert plan.clauses[0].source == "__data['name'] == 'John7'"
+        assert [c.hint for c in plan.clauses] == [
+            ("eq", "name", "John7"),
+            ("eq", "cat", "a"),
+        ]
+
+    @staticmethod
+    def test_index_candidates():
+        index = QueryIndex([{"name": "ab"}, {"name": "abc"}, {"name": "b"}, {"x": 1}])
+        assert index.candidates("eq", "name", "ab") == [0]
+        assert index.candidates("prefix", "name", "ab") == [0, 1]
+        assert index.candidates("eq", "x", "1") == [3]
+        assert index.candidates("eq", "missing", "1") == []
+
+
+class TestQuerySet:
+    QUERIES = [
+        "name is John",
+        "name is John and age is 30",
+        "not name is John",
+        "name pattern of J*",
+        "bio contains engineer or name pattern of J*",
+        "(name contains Jo or age < 30) and not title contains Manager",
+        "J.*",
+        "len(name) > 3 and bio contains engineer",
+    ]
+    RECORDS = [
+        {"name": "John", "age": 30, "bio": "engineer", "title": "Dev"},
+        {"name": "Jolyne", "age": "25", "title": "Project Manager"},
+        {"name": "Alice", "bio": "software engineer"},
+        {"age": 30},
+        {"id": "Jack"},
+    ]
+
+    @classmethod
+    def test_match_agrees_with_validate(cls):
+        queries = [query.parse(q, cache="none") for q in cls.QUERIES]
+        qs = QuerySet(queries)
+        for record in cls.RECORDS:
+            expected = 0
+            for i, q in enumerate(queries):
+                if q.validate(record):
+                    expected |= 1 << i
+            assert qs.match(record) == expected, record
+            assert qs.matching(record) == [q for q in queries if q.validate(record)]
+
+    @classmethod
+    def test_predicates_and_fields_are_shared(cls):
+        qs = QuerySet(cls.QUERIES)
+        assert len(qs) == len(cls.QUERIES)
+        assert qs.fields == ("name", "age", "bio", "title")
+        # "name is John" and "J*" each appear in several queries
+        assert len(qs.predicates) == 9
+
+    @staticmethod
+    def test_errors_surface_only_when_reached():
+        qs = QuerySet(["kind is a and code > 500", "kind is b"])
+        assert qs.match({"kind": "b", "code": 1}) == 2
+        with pytest.raises(TypeError):
+            qs.match({"kind": "a", "code": 1})
@@ -1,5 +1,13 @@
 import pytest
-from zuu.UTILS.traverse import get_deep, set_deep, del_deep, set_default_deep
+from zuu.UTILS.traverse import (
+    compile_path,
+    get_deep,
+    get_deep_many,
+    set_deep_many,
+    set_deep,
+    del_deep,
+    set_default_deep,
+)
 
 class TestDrillFunctions:
     @pytest.fixture
@@ -162,3 +170,93 @@ class TestComplexDataStructures:
             get_deep(complex_data, "settings", "theme", "animations", "duration")
             == "0.3s"
         )
+
+
+class TestCompiledPath:
+    @pytest.fixture
+    def nested_dict(self):
+        return {"a": {"b": {"c": 1, "d": [2, 3, 4]}}, "x": [{"y": 5}, {"z": 6}]}
+
+    def test_get_matches_get_deep(self, nested_dict):
+        for keys in [("a", "b", "c"), ("a", "b", "d", 1), ("x", "1", "z")]:
+            assert compile_path(*keys).get(nested_dict) == get_deep(nested_dict, *keys)
+
+    def test_get_missing(self, nested_dict):
+        path = compile_path("a", "b", "e")
+        with pytest.raises(KeyError):
+            path.get(nested_dict)
+        assert path.get(nested_dict, default=None) is None
+        with pytest.raises(KeyError):
+            compile_path("x", 5).get(nested_dict)
+
+    def test_get_other_containers(self):
+        class Obj:
+            attr = {"k": (10, 20)}
+
+        path = compile_path("o", "attr", "k", 1)
+        assert path.get({"o": Obj()}) == 20
+        assert compile_path("s", 0).get({"s": {7}}) == 7
+        with pytest.raises(KeyError):
+            compile_path("o", "nope").get({"o": Obj()})
+
+    def test_get_many(self):
+        records = [{"u": {"city": "Paris"}}, {"u": {}}, {"u": {"city": "Oslo"}}]
+        path = compile_path("u", "city")
+        assert path.get_many(records, default=None) == ["Paris", None, "Oslo"]
+        with pytest.raises(KeyError):
+            path.get_many(records)
+
+    def test_set_delete_setdefault(self, nested_dict):
+        compile_path("a", "new", "k").set(nested_dict, 1)
+        assert nested_dict["a"]["new"]["k"] == 1
+
+        compile_path("a", "b", "c").setdefault(nested_dict, 100)
+        assert nested_dict["a"]["b"]["c"] == 1
+        compile_path("x", 3).setdefault(nested_dict, "p", fillpadding=True)
+        assert nested_dict["x"][3] == "p"
+
+        compile_path("a", "b", "d", 0).delete(nested_dict)
+        assert nested_dict["a"]["b"]["d"] == [3, 4]
+
+    def test_compile_path_is_cached(self):
+        assert compile_path("a", 0) is compile_path("a", 0)
+        with pytest.raises(ValueError):
+            compile_path()
+
+
+class TestBatchAccess:
+    @pytest.fixture
+    def nested_dict(self):
+        return {"a": {"b": {"c": 1, "d": [2, 3, 4]}}, "x": [{"y": 5}, {"z": 6}]}
+
+    def test_get_deep_many(self, nested_dict):
+        paths = ["a.b.c", ("a", "b", "d", 2), "x.1.z", "a.b.missing", ("x", 9)]
+        assert get_deep_many(nested_dict, paths) == [1, 4, 6, None, None]
+        assert get_deep_many(nested_dict, ["a.q"], default=0) == [0]
+        assert get_deep_many(nested_dict, ["a/b/c"], sep="/") == [1]
+        assert get_deep_many(nested_dict, [["a", "b", "c"]]) == [1]
+
+    def test_get_deep_many_bad_list_keys_miss(self, nested_dict):
+        paths = ["x.y", "a.b.d.first", "a.b.c.deeper", "x.0.y"]
+        assert get_deep_many(nested_dict, paths, default=-1) == [-1, -1, -1, 5]
+
+    def test_get_deep_many_matches_get_deep(self, nested_dict):
+        paths = [("a",), ("a", "b"), ("a", "b", "d", 0), ("x", 0, "y")]
+        expected = [get_deep(nested_dict, *keys) for keys in paths]
+        assert get_deep_many(nested_dict, paths) == expected
+
+    def test_set_deep_many(self, nested_dict):
+        set_deep_many(
+            nested_dict,
+            {"a.b.c": 10, ("a", "b", "e"): "new", "n.m": 1, ("x", 0, "y"): 15},
+        )
+        assert nested_dict["a"]["b"] == {"c": 10, "d": [2, 3, 4], "e": "new"}
+        assert nested_dict["n"] == {"m": 1}
+        assert nested_dict["x"][0]["y"] == 15
+
+    def test_set_deep_many_parent_then_child(self):
+        data = {}
+        set_deep_many(data, {"a": {}, "a.b": 1})
+        assert data == {"a": {"b": 1}}
+        with pytest.raises(ValueError):
+            set_deep_many(data, {(): 1})
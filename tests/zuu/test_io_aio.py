@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from zuu.io import aio
+
+
+def test_load_dump(tmp_path):
+    path = str(tmp_path / "data.json")
+
+    async def main():
+        await aio.dump({"a": 1}, path)
+        small = await aio.load(path)
+        large = await aio.load(path, inline_threshold=0)
+        return small, large
+
+    assert asyncio.run(main()) == ({"a": 1}, {"a": 1})
+
+
+def test_compressed_load_is_offloaded(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.json.gz")
+    calls = []
+    original = aio._run
+
+    async def spy(call, inline, executor):
+        calls.append(inline)
+        return await original(call, inline, executor)
+
+    monkeypatch.setattr(aio, "_run", spy)
+
+    async def main():
+        await aio.dump({"a": 1}, path)
+        return await aio.load(path)
+
+    assert asyncio.run(main()) == {"a": 1}
+    assert calls == [False, False]
+
+
+def test_load_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(aio.load(str(tmp_path / "missing.json")))
+
+
+def test_loads_dumps():
+    async def main():
+        text = await aio.dumps({"a": [1, 2]})
+        return await aio.loads(text), await aio.loads(text, inline_threshold=0)
+
+    assert asyncio.run(main()) == ({"a": [1, 2]}, {"a": [1, 2]})
+
+    with pytest.raises(ValueError):
+        asyncio.run(aio.dumps({}, format="nope"))
+
+
+def test_small_load_reads_off_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.json")
+    calls = []
+    original = aio._run
+
+    async def spy(call, inline, executor):
+        calls.append((call.func.__name__, inline))
+        return await original(call, inline, executor)
+
+    monkeypatch.setattr(aio, "_run", spy)
+
+    async def main():
+        await aio.dump({"a": 1}, path)
+        return await aio.load(path), await aio.load(path, inline_threshold=0)
+
+    assert asyncio.run(main()) == ({"a": 1}, {"a": 1})
+    assert calls[1:] == [("_read_or_load", False), ("_read_or_load", False)]
+
+
+def test_load_missing_without_throw(tmp_path):
+    path = str(tmp_path / "missing.json")
+    assert asyncio.run(aio.load(path, _throw_error=False)) is None
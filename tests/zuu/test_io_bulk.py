@@ -0,0 +1,35 @@
+import pytest
+from zuu.io import load_many, dump_many
+
+
+def test_dump_and_load_many(tmp_path):
+    items = {str(tmp_path / f"data{i}.json"): {"i": i} for i in range(10)}
+    assert all(res.ok for res in dump_many(items))
+
+    results = list(load_many(items, workers=4))
+    assert [res.path for res in results] == list(items)
+    assert [res.value for res in results] == list(items.values())
+
+
+def test_errors_are_captured(tmp_path):
+    good = str(tmp_path / "good.json")
+    list(dump_many([({"a": 1}, good)]))
+
+    results = list(load_many([good, str(tmp_path / "missing.json")], ordered=False))
+    assert len(results) == 2
+    failed = [res for res in results if not res.ok]
+    assert len(failed) == 1
+    assert isinstance(failed[0].error, FileNotFoundError)
+
+
+def test_process_mode(tmp_path):
+    paths = [str(tmp_path / f"data{i}.toml") for i in range(3)]
+    pytest.importorskip("toml")
+    list(dump_many([({"i": i}, path) for i, path in enumerate(paths)]))
+    results = list(load_many(paths, mode="process", workers=2))
+    assert [res.value for res in results] == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        load_many([], mode="fiber")
@@ -0,0 +1,59 @@
+import pytest
+from zuu.io import load, dump, cached_load, LoadCache
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    path = str(tmp_path / "data.json")
+    cache = LoadCache()
+    dump({"a": 1}, path)
+
+    assert cached_load(path, cache=cache) == {"a": 1}
+    assert cached_load(path, cache=cache) == {"a": 1}
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+    dump({"a": 22}, path)
+    assert load(path, cache=cache) == {"a": 22}
+    assert cache.info()["misses"] == 2
+
+
+def test_cache_modes(tmp_path):
+    path = str(tmp_path / "data.json")
+    dump({"a": [1]}, path)
+
+    copied = LoadCache(mode="copy")
+    first = cached_load(path, cache=copied)
+    first["a"].append(2)
+    assert cached_load(path, cache=copied) == {"a": [1]}
+
+    shared = LoadCache(mode="shared")
+    assert cached_load(path, cache=shared) is cached_load(path, cache=shared)
+
+    frozen = LoadCache(mode="frozen")
+    value = cached_load(path, cache=frozen)
+    assert value["a"] == (1,)
+    with pytest.raises(TypeError):
+        value["b"] = 1
+
+    with pytest.raises(ValueError):
+        LoadCache(mode="other")
+
+
+def test_cache_memory_cap(tmp_path):
+    cache = LoadCache(maxbytes=15)
+    for i in range(3):
+        path = str(tmp_path / f"data{i}.json")
+        dump({"key": i}, path)
+        cached_load(path, cache=cache)
+    info = cache.info()
+    assert info["bytes"] <= 15
+    assert info["evictions"] == 2
+
+
+def test_cache_missing_file(tmp_path):
+    path = str(tmp_path / "missing.json")
+    cache = LoadCache()
+    assert load(path, cache=cache, _throw_error=False) is None
+    with pytest.raises(FileNotFoundError):
+        load(path, cache=cache)
+    assert cache.info()["entries"] == 0
@@ -0,0 +1,71 @@
+import gzip
+import pytest
+from zuu.io import load, dump, iter_load, load_mapped, strip_compression
+
+DATA = {"name": "zuu", "items": list(range(100))}
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+@pytest.mark.parametrize("inner", [".json", ".pickle", ".toml"])
+def test_roundtrip(tmp_path, suffix, inner):
+    if inner == ".toml":
+        pytest.importorskip("toml")
+    path = str(tmp_path / f"data{inner}{suffix}")
+    dump(DATA, path)
+    assert load(path) == DATA
+
+
+def test_legacy_seq(tmp_path):
+    from zuu.io import DEFAULT_DUMP, DEFAULT_LOAD
+
+    path = str(tmp_path / "data.json.gz")
+    dump(DATA, path, _seq=list(DEFAULT_DUMP))
+    assert load(path, _seq=list(DEFAULT_LOAD)) == DATA
+
+
+def test_file_is_compressed(tmp_path):
+    path = str(tmp_path / "data.json.gz")
+    dump(DATA, path, compresslevel=1)
+    with gzip.open(path, "rt") as f:
+        assert f.read().startswith("{")
+
+
+def test_deterministic_for_skip_unchanged(tmp_path):
+    path = tmp_path / "data.json.gz"
+    dump(DATA, str(path), atomic=True, skip_unchanged=True)
+    first = path.read_bytes()
+    dump(DATA, str(path), skip_unchanged=True)
+    assert path.read_bytes() == first
+
+
+def test_iter_and_mapped(tmp_path):
+    path = tmp_path / "data.jsonl.gz"
+    with gzip.open(path, "wt") as f:
+        f.write('{"a": 1}\n{"a": 2}\n')
+    assert list(iter_load(str(path))) == [{"a": 1}, {"a": 2}]
+    with load_mapped(str(path)) as view:
+        assert bytes(view).startswith(b'{"a": 1}')
+
+
+def test_strip_compression():
+    assert strip_compression("a/data.json.gz") == "a/data.json"
+    assert strip_compression("a/data.json") == "a/data.json"
+
+
+def test_text_loaders_default_to_utf8(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    for name, text in [("a.toml.gz", 'a = "é"\n'), ("a.yaml", "a: é\n")]:
+        path = tmp_path / name
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(path, "wb") as f:
+            f.write(text.encode("utf-8"))
+    env = {**os.environ, "LC_ALL": "C", "PYTHONUTF8": "0"}
+    code = (
+        "import sys; from zuu.io import load; "
+        "assert all(load(p) == {'a': chr(233)} for p in sys.argv[1:])"
+    )
+    paths = [str(tmp_path / "a.toml.gz"), str(tmp_path / "a.yaml")]
+    subprocess.run([sys.executable, "-c", code, *paths], env=env, check=True)
@@ -0,0 +1,37 @@
+import pytest
+from zuu.io import iter_load, load, dump
+
+
+def test_iter_jsonl(tmp_path):
+    path = tmp_path / "data.jsonl"
+    path.write_text('{"a": 1}\n\n{"a": 2}\n[3]\n')
+    assert list(iter_load(str(path))) == [{"a": 1}, {"a": 2}, [3]]
+
+
+def test_iter_ndjson_batches(tmp_path):
+    path = tmp_path / "data.ndjson"
+    path.write_text("\n".join(str(i) for i in range(5)))
+    assert list(iter_load(str(path), batch_size=2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_iter_csv(tmp_path):
+    path = str(tmp_path / "data.csv")
+    dump([["name", "age"], ["a", "1"], ["b", "2"]], path)
+    assert list(iter_load(path)) == [["name", "age"], ["a", "1"], ["b", "2"]]
+    assert list(iter_load(path, dict_rows=True)) == [
+        {"name": "a", "age": "1"},
+        {"name": "b", "age": "2"},
+    ]
+    assert load(path) == [["name", "age"], ["a", "1"], ["b", "2"]]
+
+
+def test_iter_txt(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("one\ntwo\n")
+    assert list(iter_load(str(path))) == ["one", "two"]
+    assert list(iter_load(str(path), keepends=True)) == ["one\n", "two\n"]
+
+
+def test_iter_unknown(tmp_path):
+    with pytest.raises(ValueError):
+        iter_load(str(tmp_path / "data.bin"))
@@ -50,4 +50,25 @@ def test_json_ensure_ascii_behavior(temp_json_file):
     dump_json_w_encoding(test_data, temp_json_file)
     with open(temp_json_file, 'r', encoding='utf-8') as f:
         content = f.read()
-        assert 'こんにちは' in content  # Raw characters 
\ No newline at end of file
+        assert 'こんにちは' in content  # Raw characters 
+
+def test_json_mmap(temp_json_file):
+    test_data = {"japanese": "こんにちは", "list": [1, 2, 3]}
+
+    dump_json_w_encoding(test_data, temp_json_file)
+    assert load_json(temp_json_file, mmap=True) == test_data
+    assert load_json_w_encoding(temp_json_file, mmap=True) == test_data
+
+
+def test_load_mapped(tmp_path):
+    from zuu.io import load_mapped, load_txt
+
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"hello world")
+    with load_mapped(str(path)) as view:
+        assert bytes(view[:5]) == b"hello"
+    assert load_txt(str(path), mmap=True) == "hello world"
+
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert load_txt(str(empty), mmap=True) == ""
@@ -0,0 +1,55 @@
+import pytest
+
+orjson_io = pytest.importorskip("zuu.io.orjson")
+
+
+@pytest.fixture
+def temp_json_file(tmp_path):
+    return str(tmp_path / "test.json")
+
+
+def test_dump_writes_content(temp_json_file):
+    orjson_io.dump_json({"a": [1, 2]}, temp_json_file)
+    with open(temp_json_file, "rb") as f:
+        assert f.read() == b'{"a":[1,2]}'
+    assert orjson_io.load_json(temp_json_file) == {"a": [1, 2]}
+
+
+def test_dump_option_flags(temp_json_file):
+    orjson_io.dump_json(
+        {"b": 1, 2: "x"}, temp_json_file, sort_keys=True, non_str_keys=True
+    )
+    with open(temp_json_file, "rb") as f:
+        assert f.read() == b'{"2":"x","b":1}'
+
+    orjson_io.dump_json({"a": 1}, temp_json_file, dump={"indent": 2})
+    with open(temp_json_file, "rb") as f:
+        assert f.read() == b'{\n  "a": 1\n}'
+
+
+def test_default_dispatch_uses_orjson(temp_json_file):
+    orjson_io.dump({"a": 1}, temp_json_file, append_newline=True)
+    with open(temp_json_file, "rb") as f:
+        assert f.read() == b'{"a":1}\n'
+
+
+def test_w_encoding(temp_json_file):
+    data = {"text": "こんにちは"}
+    orjson_io.dump_json_w_encoding(data, temp_json_file)
+    assert orjson_io.load_json_w_encoding(temp_json_file) == data
+
+    orjson_io.dump_json_w_encoding(data, temp_json_file, encoding="utf-16")
+    assert orjson_io.load_json_w_encoding(temp_json_file, encoding="utf-16") == data
+
+
+def test_dumps_json():
+    assert orjson_io.dumps_json({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+
+
+def test_loads_kwargs_fall_back_to_stdlib():
+    from decimal import Decimal
+
+    assert orjson_io.loads_json('{"a": 1.5}') == {"a": 1.5}
+    assert orjson_io.loads_json('{"a": 1.5}', parse_float=Decimal) == {
+        "a": Decimal("1.5")
+    }
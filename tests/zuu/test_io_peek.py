@@ -0,0 +1,61 @@
+import json
+import pytest
+from zuu.io import load_path
+
+DOC = {
+    "version": "1.2.0",
+    "skip": {"deep": [{"x": "}]\"{["}] * 3, "s": "a\\\"b"},
+    "a": {"b": [{"c": 1}, {"c": [True, None, -1.5e3]}], "esc\"key": "v"},
+    "last": [],
+}
+
+
+@pytest.fixture
+def doc_path(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(DOC, indent=2))
+    return str(path)
+
+
+@pytest.mark.parametrize("key, expected", [
+    ("version", "1.2.0"),
+    ("a.b.0.c", 1),
+    ("a.b.1.c", [True, None, -1500.0]),
+    ("a.b.1.c.1", None),
+    ("a.b.1", {"c": [True, None, -1500.0]}),
+    ("skip.s", 'a\\"b'),
+    (["a", 'esc"key'], "v"),
+    ("last", []),
+])
+def test_load_path(doc_path, key, expected):
+    assert load_path(doc_path, key) == expected
+
+
+@pytest.mark.parametrize("key", ["missing", "a.b.2", "a.b.x", "version.x", "last.0"])
+def test_load_path_missing(doc_path, key):
+    with pytest.raises(KeyError):
+        load_path(doc_path, key)
+    assert load_path(doc_path, key, default="d") == "d"
+
+
+def test_load_path_other_formats(tmp_path):
+    path = str(tmp_path / "data.pickle")
+    import pickle
+
+    with open(path, "wb") as f:
+        pickle.dump({"a": [{"b": 2}]}, f)
+    assert load_path(path, "a.0.b") == 2
+
+
+@pytest.mark.parametrize("escaped", [False, True])
+def test_load_path_skips_large_containers(tmp_path, escaped):
+    text = 'a\\"}]' if escaped else "}]{["
+    doc = {
+        "big": [{"s": text, "n": [1, {"q": "]"}]} for _ in range(20000)],
+        "long": "x" * 600000,
+        "version": 9,
+    }
+    path = tmp_path / "big.json"
+    path.write_text(json.dumps(doc))
+    assert load_path(str(path), "version") == 9
+    assert load_path(str(path), "big.19999.n.1.q") == "]"
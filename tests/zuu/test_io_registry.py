@@ -0,0 +1,84 @@
+import pytest
+from zuu.io import load, dump, FormatRegistry, DEFAULT_LOAD, DEFAULT_DUMP
+
+
+def test_suffix_dispatch(tmp_path):
+    path = str(tmp_path / "data.json")
+    dump({"a": 1}, path)
+    assert load(path) == {"a": 1}
+
+
+def test_sniffer_fallback(tmp_path):
+    path = tmp_path / "data.conf"
+    path.write_text('{"a": 1}')
+    assert load(str(path)) == {"a": 1}
+
+
+def test_no_loader(tmp_path):
+    path = tmp_path / "data.unknown"
+    path.write_text("plain")
+    with pytest.raises(ValueError):
+        load(str(path))
+
+
+def test_dump_unknown_suffix_missing_file(tmp_path):
+    with pytest.raises(ValueError):
+        dump({"a": 1}, str(tmp_path / "data.unknown"))
+
+
+def test_priority_order(tmp_path):
+    path = str(tmp_path / "data.cfg")
+    registry = FormatRegistry()
+    registry.register(".cfg", lambda p: "low")
+    registry.register(".cfg", lambda p: "high", priority=10)
+    assert load(path, _seq=registry) == "high"
+
+
+def test_try_all_falls_through(tmp_path):
+    path = str(tmp_path / "data.cfg")
+
+    def broken(p):
+        raise RuntimeError
+
+    registry = FormatRegistry()
+    registry.register(".cfg", broken, priority=1)
+    registry.register(".cfg", lambda p: "ok")
+    assert load(path, _seq=registry, _try_all=True) == "ok"
+
+
+def test_legacy_seq(tmp_path):
+    path = tmp_path / "data.any"
+    path.write_text("x")
+    seq = [[lambda p: p.endswith(".any"), lambda p: "legacy"]]
+    assert load(str(path), _seq=seq) == "legacy"
+
+
+def test_registry_iterates_as_pairs(tmp_path):
+    pairs = list(DEFAULT_LOAD)
+    assert len(pairs) == len(DEFAULT_LOAD)
+    path = str(tmp_path / "data.json")
+    dump([1, 2], path)
+    assert load(path, _seq=pairs) == [1, 2]
+    assert any(v(path, [1]) for v, _ in DEFAULT_DUMP)
+
+
+def test_registry_list_compat(tmp_path):
+    registry = DEFAULT_LOAD.copy()
+    validator, handler = registry[0]
+    assert validator(str(tmp_path / "a.json"))
+    registry.insert(0, [lambda p: p.endswith(".json"), lambda p: "first"])
+    registry.append([lambda p: p.endswith(".any"), lambda p: "appended"])
+    assert load(str(tmp_path / "a.json"), _seq=registry) == "first"
+    assert load(str(tmp_path / "a.any"), _seq=registry) == "appended"
+    registry[0][1] = lambda p: "swapped"
+    assert load(str(tmp_path / "a.json"), _seq=registry) == "swapped"
+    combined = registry + [[lambda p: p.endswith(".zzz"), lambda p: "added"]]
+    assert load(str(tmp_path / "a.zzz"), _seq=combined) == "added"
+    assert len(registry) == len(DEFAULT_LOAD) + 2
+
+
+def test_defaults_are_utf8(tmp_path):
+    path = tmp_path / "data.json"
+    dump({"a": "é"}, str(path))
+    assert "é".encode("utf-8") in path.read_bytes()
+    assert load(str(path)) == {"a": "é"}
@@ -0,0 +1,70 @@
+import pickle
+import pytest
+from zuu.io import loads, sniff, sniff_format
+
+
+@pytest.mark.parametrize("payload, expected", [
+    ('{"a": 1}', "json"),
+    ("[1, 2]", "json"),
+    (b'  {"a": [1]}\n', "json"),
+    (memoryview(b"[true]"), "json"),
+    ('<?xml version="1.0"?><a/>', "xml"),
+    ("<a><b/></a>", "xml"),
+    (pickle.dumps({"a": 1}), "pickle"),
+    ("[server]\nport = 80\n", "toml"),
+    ("[table]", "toml"),
+    ("name: test\nitems:\n  - a\n", "yaml"),
+    ("---\na: 1\n", "yaml"),
+    ("a,b\n1,2\n", "csv"),
+    ("a\tb\n1\t2\n", "csv"),
+    ("plain text", None),
+])
+def test_sniff_format(payload, expected):
+    assert sniff_format(payload) == expected
+
+
+def test_sniff_ranks_by_confidence():
+    ranked = sniff('{"a": 1}')
+    assert [fmt for fmt, _ in ranked] == ["json", "yaml"]
+    assert ranked[0][1] > ranked[1][1]
+
+
+def test_sniff_long_payload_uses_tail():
+    payload = "[" + ", ".join(["1"] * 5000) + "]"
+    assert sniff_format(payload, limit=64) == "json"
+
+
+def test_loads_parses_once():
+    import zuu.io as zio
+
+    calls = []
+    seq = [[validator, lambda s, loader=loader: calls.append(1) or loader(s)]
+           for validator, loader in zio.DEFAULT_LOADS]
+    assert loads('{"a": 1}', _seq=seq) == {"a": 1}
+    assert loads("[server]\nport = 80\n", _seq=seq) == {"server": {"port": 80}}
+    assert len(calls) == 2
+
+
+def test_loads_formats():
+    assert loads(b'{"a": 1}') == {"a": 1}
+    with pytest.raises(ValueError):
+        loads(pickle.dumps([1, 2]))
+    assert loads("a: 1\n") == {"a": 1}
+    assert loads("a,b\n1,2\n") == [["a", "b"], ["1", "2"]]
+    assert loads("a\tb\n1\t2\n") == [["a", "b"], ["1", "2"]]
+    assert loads("a;b,c\n1;2,3\n") == [["a;b", "c"], ["1;2", "3"]]
+    assert loads("a;b\n1;2\n") == [["a", "b"], ["1", "2"]]
+    with pytest.raises(ValueError):
+        loads("plain text")
+
+
+def test_loads_pickle_opt_in():
+    from zuu.io import PICKLE_LOADS
+
+    assert loads(pickle.dumps([1, 2]), _seq=PICKLE_LOADS) == [1, 2]
+    assert loads('{"a": 1}', _seq=PICKLE_LOADS) == {"a": 1}
+
+
+def test_loads_legacy_seq():
+    seq = [[lambda s: s.startswith("x"), lambda s: "legacy"]]
+    assert loads("xyz", _seq=seq) == "legacy"
@@ -0,0 +1,59 @@
+import os
+import pytest
+from zuu.io import dump, load, open_write
+
+
+def test_atomic_dump(tmp_path):
+    path = str(tmp_path / "data.json")
+    dump({"a": 1}, path, atomic=True, fsync=True)
+    assert load(path) == {"a": 1}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_atomic_failure_keeps_original(tmp_path):
+    path = str(tmp_path / "data.json")
+    dump({"a": 1}, path)
+
+    with pytest.raises(TypeError):
+        dump({"a": object()}, path, atomic=True)
+
+    assert load(path) == {"a": 1}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_atomic_keeps_mode(tmp_path):
+    path = str(tmp_path / "data.txt")
+    dump("one", path)
+    os.chmod(path, 0o640)
+    dump("two", path, atomic=True)
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_atomic_new_file_matches_plain_open(tmp_path):
+    plain = str(tmp_path / "plain.txt")
+    atomic = str(tmp_path / "atomic.txt")
+    dump("x", plain)
+    dump("x", atomic, atomic=True)
+    assert os.stat(atomic).st_mode & 0o777 == os.stat(plain).st_mode & 0o777
+
+
+def test_skip_unchanged(tmp_path):
+    path = str(tmp_path / "data.json")
+    dump({"a": 1}, path, skip_unchanged=True)
+    os.utime(path, ns=(0, 0))
+
+    dump({"a": 1}, path, skip_unchanged=True)
+    assert os.stat(path).st_mtime_ns == 0
+
+    dump({"a": 2}, path, skip_unchanged=True)
+    assert os.stat(path).st_mtime_ns != 0
+    assert load(path) == {"a": 2}
+
+
+def test_open_write_buffering(tmp_path):
+    path = str(tmp_path / "data.bin")
+    with open_write(path, "wb", atomic=True, buffering=1 << 20) as f:
+        f.write(b"x" * 10)
+    with open(path, "rb") as f:
+        assert f.read() == b"x" * 10
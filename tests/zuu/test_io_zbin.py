@@ -0,0 +1,79 @@
+import os
+
+import pytest
+from zuu.io import load, dump, iter_load, append_zbin, append_msgpack, dump_zbin
+
+pytest.importorskip("msgpack")
+
+DATA = {"name": "zuu", "nested": {"list": [1, 2.5, None, True], 1: b"raw"}}
+
+
+@pytest.mark.parametrize("suffix", [".msgpack", ".zbin"])
+def test_roundtrip(tmp_path, suffix):
+    path = str(tmp_path / f"data{suffix}")
+    dump(DATA, path)
+    assert load(path) == DATA
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "lzma"])
+def test_zbin_compression_and_append(tmp_path, compression):
+    path = str(tmp_path / "data.zbin")
+    dump({"i": 0, "pad": "x" * 1000}, path, compression=compression, level=1)
+    for i in range(1, 3):
+        append_zbin({"i": i}, path)
+    records = list(iter_load(path))
+    assert [r["i"] for r in records] == [0, 1, 2]
+    assert load(path)["pad"] == "x" * 1000
+
+
+def test_zbin_compresses(tmp_path):
+    plain = tmp_path / "plain.zbin"
+    packed = tmp_path / "packed.zbin"
+    dump_zbin(["same"] * 1000, str(plain))
+    dump_zbin(["same"] * 1000, str(packed), compression="zlib")
+    assert packed.stat().st_size < plain.stat().st_size / 10
+
+
+def test_zbin_errors(tmp_path):
+    path = tmp_path / "bad.zbin"
+    path.write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        load(str(path))
+    with pytest.raises(ValueError):
+        dump_zbin({}, str(path), compression="brotli")
+
+
+def test_msgpack_append(tmp_path):
+    path = str(tmp_path / "log.msgpack")
+    for i in range(3):
+        append_msgpack({"i": i}, path)
+    assert list(iter_load(path, batch_size=2)) == [[{"i": 0}, {"i": 1}], [{"i": 2}]]
+
+
+@pytest.mark.parametrize("suffix", [".msgpack", ".msgpack.gz"])
+def test_msgpack_write_options(tmp_path, suffix):
+    path = tmp_path / f"data{suffix}"
+    dump(DATA, str(path), atomic=True)
+    assert load(str(path)) == DATA
+    os.utime(path, ns=(0, 0))
+    dump(DATA, str(path), skip_unchanged=True)
+    assert path.stat().st_mtime_ns == 0
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize(
+    "suffix, append", [(".msgpack", append_msgpack), (".zbin", append_zbin)]
+)
+def test_append_then_load(tmp_path, suffix, append):
+    path = str(tmp_path / f"log{suffix}")
+    for i in range(3):
+        append({"i": i}, path)
+    assert load(path) == {"i": 0}
+    assert list(iter_load(path)) == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+
+def test_load_empty_msgpack(tmp_path):
+    path = tmp_path / "empty.msgpack"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        load(str(path))